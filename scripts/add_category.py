@@ -9,6 +9,7 @@ Category mapping (based on BANK_TAGS):
 - Upbeat: strobe, spatial, signature, fast
 """
 
+from functools import lru_cache
 from pathlib import Path
 
 BANK_TAGS = {
@@ -18,33 +19,41 @@ BANK_TAGS = {
     'Upbeat': ['strobe', 'spatial', 'signature', 'fast'],
 }
 
-def determine_category(tags: list[str]) -> str:
-    """Determine category from tags. Returns first matching category or 'Chill' as default."""
-    tags_lower = [t.lower() for t in tags]
+# Inverted BANK_TAGS index, built once at import
+TAG_TO_CATEGORY = {
+    tag: category
+    for category, category_tags in BANK_TAGS.items()
+    for tag in category_tags
+}
+
+@lru_cache(maxsize=None)
+def determine_category(tags: tuple[str, ...]) -> str:
+    """Determine category from lowercased tags. Returns first matching category or 'Chill' as default.
 
-    for category, category_tags in BANK_TAGS.items():
-        for tag in category_tags:
-            if tag in tags_lower:
-                return category
+    Cached per tag set, so callers should pass a sorted tuple.
+    """
+    matched = {TAG_TO_CATEGORY[t] for t in tags if t in TAG_TO_CATEGORY}
 
-    # Default to Chill if no match
-    return 'Chill'
+    # Preserve BANK_TAGS ordering when tags span several categories
+    return next((category for category in BANK_TAGS if category in matched), 'Chill')
 
 def migrate_pattern_file(file_path: Path) -> tuple[str, str]:
     """Add category to a pattern file. Returns (name, category)."""
-    text = file_path.read_text()
+    text = file_path.read_text(encoding='utf-8')
 
     if '---' not in text:
         raise ValueError(f"Missing '---' separator in {file_path}")
 
     header_text, body = text.split('---', 1)
 
-    # Parse header
+    # Parse header in a single pass, remembering where the name line sits
+    lines = header_text.strip().split('\n')
     name = ""
+    name_idx = None
     tags = []
     has_category = False
 
-    for line in header_text.strip().split('\n'):
+    for i, line in enumerate(lines):
         line = line.strip()
         if not line or ':' not in line:
             continue
@@ -54,6 +63,7 @@ def migrate_pattern_file(file_path: Path) -> tuple[str, str]:
 
         if key == 'name':
             name = value
+            name_idx = i
         elif key == 'tags':
             tags = [t.strip() for t in value.split(',') if t.strip()]
         elif key == 'category':
@@ -63,20 +73,16 @@ def migrate_pattern_file(file_path: Path) -> tuple[str, str]:
         print(f"  Skipping {file_path.name} (already has category)")
         return name, ""
 
-    category = determine_category(tags)
+    category = determine_category(tuple(sorted(t.lower() for t in tags)))
 
     # Insert category line after name line
-    new_lines = []
-    for line in header_text.strip().split('\n'):
-        new_lines.append(line)
-        stripped = line.strip()
-        if stripped.startswith('name:'):
-            new_lines.append(f"category: {category}")
-
-    new_header = '\n'.join(new_lines)
+    if name_idx is not None:
+        lines.insert(name_idx + 1, f"category: {category}")
+
+    new_header = '\n'.join(lines)
     new_content = f"{new_header}\n---{body}"
 
-    file_path.write_text(new_content)
+    file_path.write_text(new_content, encoding='utf-8')
     return name, category
 
 def main():
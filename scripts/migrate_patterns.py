@@ -7,8 +7,35 @@ Usage: uv run python scripts/migrate_patterns.py [--dry-run]
 import ast
 import re
 import sys
+import textwrap
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+
+def _kw_tags(value: ast.expr, result: dict) -> None:
+    if isinstance(value, ast.List):
+        result["tags"] = [elt.value for elt in value.elts if isinstance(elt, ast.Constant)]
+
+
+def _kw_palette(value: ast.expr, result: dict) -> None:
+    if isinstance(value, ast.Constant):
+        result["palette"] = value.value
+
+
+def _kw_description(value: ast.expr, result: dict) -> None:
+    if isinstance(value, ast.Constant):
+        result["description"] = value.value
+
+
+# Handlers for @pattern(...) keyword arguments, keyed by keyword name
+_KEYWORD_HANDLERS = {
+    "tags": _kw_tags,
+    "palette": _kw_palette,
+    "description": _kw_description,
+}
+
 
 def extract_decorator_args(decorator_node: ast.Call) -> dict:
     """Extract arguments from @pattern(...) decorator."""
@@ -21,16 +48,11 @@ def extract_decorator_args(decorator_node: ast.Call) -> dict:
         elif i == 1 and isinstance(arg, ast.Constant):
             result["description"] = arg.value
 
-    # Keyword args: tags, palette
+    # Keyword args: tags, palette, description
     for kw in decorator_node.keywords:
-        if kw.arg == "tags" and isinstance(kw.value, ast.List):
-            result["tags"] = [
-                elt.value for elt in kw.value.elts if isinstance(elt, ast.Constant)
-            ]
-        elif kw.arg == "palette" and isinstance(kw.value, ast.Constant):
-            result["palette"] = kw.value.value
-        elif kw.arg == "description" and isinstance(kw.value, ast.Constant):
-            result["description"] = kw.value.value
+        handler = _KEYWORD_HANDLERS.get(kw.arg)
+        if handler:
+            handler(kw.value, result)
 
     return result
 
@@ -54,61 +76,52 @@ def extract_function_body(source_lines: list[str], func_node: ast.FunctionDef) -
 
     body_end = func_node.end_lineno  # 1-indexed, inclusive
 
-    # Extract body lines
-    body_lines = source_lines[body_start:body_end]
-
-    # Find the base indentation (first non-empty line)
-    base_indent = 0
-    for line in body_lines:
-        stripped = line.lstrip()
-        if stripped:
-            base_indent = len(line) - len(stripped)
-            break
-
-    # Remove base indentation from all lines
-    dedented_lines = []
-    for line in body_lines:
-        if line.strip():  # Non-empty line
-            dedented_lines.append(line[base_indent:] if len(line) > base_indent else line)
-        else:
-            dedented_lines.append("")
-
-    body_text = "\n".join(dedented_lines).strip()
+    # Extract and dedent body lines
+    body_text = textwrap.dedent("\n".join(source_lines[body_start:body_end])).strip()
 
     # If it's just a return statement, extract the expression
-    if body_text.startswith("return "):
+    if body_text.startswith("return ") or body_text.startswith("return("):
         # Simple case: single return statement
-        return body_text[7:].strip()  # Remove "return "
-    elif body_text.startswith("return("):
         return body_text[6:].strip()  # Remove "return"
 
     # Complex case: has local variables before return
     # We need to wrap it so it evaluates to the pattern
     # Use a lambda-like approach: define vars, then return the result
     lines = body_text.split("\n")
-
-    # Find the return statement
     for i, line in enumerate(lines):
         stripped = line.strip()
         if stripped.startswith("return "):
             # Replace return with the expression being returned
-            expr = stripped[7:].strip()
-            lines[i] = expr
+            lines[i] = stripped[7:].strip()
             break
         elif stripped.startswith("return("):
-            expr = stripped[6:].strip()
-            lines[i] = expr
+            lines[i] = stripped[6:].strip()
             break
 
     return "\n".join(lines)
 
 
-def convert_pattern_file(py_path: Path, dry_run: bool = False) -> list[Path]:
+def convert_pattern_file(
+    py_path: Path,
+    dry_run: bool = False,
+    pending: dict[Path, str] | None = None,
+    seen: set[str] | None = None,
+) -> list[Path]:
     """Convert a Python pattern file to one or more .pattern files.
 
-    Returns list of created .pattern file paths.
+    If ``pending`` is given, file contents are queued there (path -> content)
+    for the caller to write in bulk instead of being written immediately.
+    ``seen`` holds the stems of .pattern files already in the directory; it is
+    seeded from disk when omitted and updated as new files are claimed.
+
+    Returns list of created (or queued) .pattern file paths.
     """
-    source = py_path.read_text()
+    source = py_path.read_text(encoding="utf-8")
+
+    # Utility modules without any @pattern functions don't need parsing
+    if "@pattern" not in source:
+        return []
+
     source_lines = source.split("\n")
 
     try:
@@ -117,9 +130,13 @@ def convert_pattern_file(py_path: Path, dry_run: bool = False) -> list[Path]:
         print(f"  ERROR: Syntax error in {py_path}: {e}")
         return []
 
+    if seen is None:
+        seen = {p.stem for p in py_path.parent.glob("*.pattern")}
+
     created_files = []
 
-    for node in ast.walk(tree):
+    # Pattern functions are always defined at module level
+    for node in tree.body:
         if not isinstance(node, ast.FunctionDef):
             continue
 
@@ -161,24 +178,26 @@ def convert_pattern_file(py_path: Path, dry_run: bool = False) -> list[Path]:
 
         # Generate filename from pattern name (slugify)
         slug = meta["name"].lower()
-        slug = re.sub(r"[^a-z0-9]+", "_", slug)
+        slug = _SLUG_RE.sub("_", slug)
         slug = slug.strip("_")
-        pattern_path = py_path.parent / f"{slug}.pattern"
 
         # Handle filename collisions
-        if pattern_path.exists():
-            i = 2
-            while True:
-                pattern_path = py_path.parent / f"{slug}_{i}.pattern"
-                if not pattern_path.exists():
-                    break
-                i += 1
+        stem = slug
+        i = 2
+        while stem in seen:
+            stem = f"{slug}_{i}"
+            i += 1
+        seen.add(stem)
+        pattern_path = py_path.parent / f"{stem}.pattern"
 
         if dry_run:
             print(f"  Would create: {pattern_path.name}")
             print(f"    Content preview: {content[:100]}...")
+        elif pending is not None:
+            pending[pattern_path] = content
+            created_files.append(pattern_path)
         else:
-            pattern_path.write_text(content)
+            pattern_path.write_text(content, encoding="utf-8")
             print(f"  Created: {pattern_path.name}")
             created_files.append(pattern_path)
 
@@ -204,13 +223,26 @@ def main():
         return
 
     all_created = []
+    pending: dict[Path, str] = {}
+    seen = {p.stem for p in patterns_dir.glob("*.pattern")}
     for py_path in py_files:
         if py_path.name.startswith("_"):
             continue
         print(f"Processing: {py_path.name}")
-        created = convert_pattern_file(py_path, dry_run)
+        created = convert_pattern_file(py_path, dry_run, pending, seen)
         all_created.extend(created)
 
+    # Write all queued pattern files in parallel to overlap filesystem calls
+    if pending:
+        print()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(
+                lambda item: item[0].write_text(item[1], encoding="utf-8"),
+                pending.items(),
+            ))
+        for pattern_path in pending:
+            print(f"  Created: {pattern_path.name}")
+
     print()
     print(f"Migration complete: {len(all_created)} pattern files created")
 
@@ -3,37 +3,54 @@
 Use this to see available lights and generate config for custom ordering.
 """
 
-import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
 import yaml
 import requests
 import urllib3
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
+# Repo-root config.yaml, resolved once at import
+CONFIG_PATH = Path(__file__).resolve().parents[3] / "config.yaml"
+
 # Suppress SSL warnings for Hue bridge self-signed cert
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 
 def load_config():
     """Load Hue config from config.yaml."""
-    config_path = os.path.join(os.path.dirname(__file__), "..", "..", "..", "config.yaml")
-
-    if not os.path.exists(config_path):
+    if not CONFIG_PATH.exists():
         raise FileNotFoundError(
-            f"Config not found: {config_path}\n" "Run 'dj-hue --setup' first."
+            f"Config not found: {CONFIG_PATH}\n"
+            "Run 'dj-hue --setup' first."
         )
 
-    with open(config_path, "r") as f:
-        config = yaml.safe_load(f)
+    config = yaml.load(CONFIG_PATH.read_text(encoding="utf-8"), Loader=_YamlLoader)
 
     return config.get("hue", {})
 
 
-def get_entertainment_config(bridge_ip: str, username: str, area_id: str) -> dict | None:
+def create_session(username: str) -> requests.Session:
+    """Create a keep-alive session authenticated against the bridge."""
+    session = requests.Session()
+    session.headers.update({"hue-application-key": username})
+    session.verify = False
+    return session
+
+
+def get_entertainment_config(
+    session: requests.Session, bridge_ip: str, area_id: str
+) -> dict | None:
     """Get entertainment configuration with channel details."""
     url = f"https://{bridge_ip}/clip/v2/resource/entertainment_configuration/{area_id}"
-    headers = {"hue-application-key": username}
 
     try:
-        response = requests.get(url, headers=headers, verify=False, timeout=5)
+        response = session.get(url, timeout=5)
         data = response.json()
         if data.get("data"):
             return data["data"][0]
@@ -43,13 +60,12 @@ def get_entertainment_config(bridge_ip: str, username: str, area_id: str) -> dic
         return None
 
 
-def get_all_lights(bridge_ip: str, username: str) -> dict[str, dict]:
+def get_all_lights(session: requests.Session, bridge_ip: str) -> dict[str, dict]:
     """Get all lights from bridge, keyed by ID."""
     url = f"https://{bridge_ip}/clip/v2/resource/light"
-    headers = {"hue-application-key": username}
 
     try:
-        response = requests.get(url, headers=headers, verify=False, timeout=5)
+        response = session.get(url, timeout=5)
         data = response.json()
 
         lights = {}
@@ -92,14 +108,21 @@ def main():
     print(f"Entertainment Area: {area_id}")
     print()
 
-    # Get all lights for name lookup
-    all_lights = get_all_lights(bridge_ip, username)
+    # Share one connection across both bridge requests
+    session = create_session(username)
+
+    # Fetch all lights (for name lookup) and the entertainment area config
+    # concurrently; neither request depends on the other
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        lights_future = executor.submit(get_all_lights, session, bridge_ip)
+        ent_future = executor.submit(get_entertainment_config, session, bridge_ip, area_id)
+        all_lights = lights_future.result()
+        ent_config = ent_future.result()
+
     if not all_lights:
         print("Error: Could not fetch lights from bridge")
         return 1
 
-    # Get entertainment area config
-    ent_config = get_entertainment_config(bridge_ip, username, area_id)
     if not ent_config:
         print("Error: Could not fetch entertainment configuration")
         return 1
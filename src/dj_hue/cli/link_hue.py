@@ -4,23 +4,24 @@ Uses Ableton Link for rock-solid tempo sync instead of audio analysis.
 """
 
 import asyncio
-import os
 import signal
-import threading
+from pathlib import Path
 import yaml
-from dataclasses import dataclass
-from typing import Dict
+from typing import Dict, Optional, Tuple
 
 from aalink import Link
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
 
-@dataclass
-class LightState:
-    """RGB state for a light."""
-    light_id: int
-    r: int
-    g: int
-    b: int
+# Repo-root config.yaml, resolved once at import
+CONFIG_PATH = Path(__file__).resolve().parents[3] / 'config.yaml'
+
+
+# Scale factor from 0-255 ints to the 0.0-1.0 floats set_input expects
+_INV255 = 1.0 / 255.0
 
 
 class HueStreamer:
@@ -42,8 +43,8 @@ class HueStreamer:
         self._bridge = None
         self._entertainment = None
         self._running = False
-        self._lock = threading.Lock()
-        self._pending_states: Dict[int, LightState] = {}
+        # No lock: set_all_lights() and flush() both run on the event loop thread
+        self._broadcast_color: Optional[Tuple[float, float, float]] = None
         self._channel_map: Dict[str, int] = {}
 
     def start(self) -> None:
@@ -89,33 +90,30 @@ class HueStreamer:
 
     def set_all_lights(self, r: int, g: int, b: int) -> None:
         """Set all lights to the same color."""
-        with self._lock:
-            for channel_id in range(len(self._channel_map)):
-                self._pending_states[channel_id] = LightState(
-                    light_id=channel_id,
-                    r=max(0, min(255, r)),
-                    g=max(0, min(255, g)),
-                    b=max(0, min(255, b)),
-                )
+        # Normalize once; every channel shares the same color
+        rgb = (
+            max(0, min(255, r)) * _INV255,
+            max(0, min(255, g)) * _INV255,
+            max(0, min(255, b)) * _INV255,
+        )
+        self._broadcast_color = rgb
 
     def flush(self) -> None:
         """Send all pending color updates."""
         if not self._streaming or not self._running:
             return
 
-        with self._lock:
-            for key, state in self._pending_states.items():
-                r_norm = state.r / 255.0
-                g_norm = state.g / 255.0
-                b_norm = state.b / 255.0
-                channel_id = key if isinstance(key, int) else self._channel_map.get(key, 0)
-
-                try:
-                    self._streaming.set_input((r_norm, g_norm, b_norm, channel_id))
-                except Exception as e:
-                    print(f"[HUE] Error: {e}")
+        rgb = self._broadcast_color
+        if rgb is None:
+            return
+        self._broadcast_color = None
 
-            self._pending_states.clear()
+        r_norm, g_norm, b_norm = rgb
+        for channel_id in range(len(self._channel_map)):
+            try:
+                self._streaming.set_input((r_norm, g_norm, b_norm, channel_id))
+            except Exception as e:
+                print(f"[HUE] Error: {e}")
 
     def stop(self) -> None:
         """Stop the streaming connection."""
@@ -147,16 +145,13 @@ COLORS = [
 
 def load_config():
     """Load Hue config from config.yaml."""
-    config_path = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'config.yaml')
-
-    if not os.path.exists(config_path):
+    if not CONFIG_PATH.exists():
         raise FileNotFoundError(
-            f"Config not found: {config_path}\n"
+            f"Config not found: {CONFIG_PATH}\n"
             "Run 'dj-hue --setup' first."
         )
 
-    with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
+    config = yaml.load(CONFIG_PATH.read_text(encoding='utf-8'), Loader=_YamlLoader)
 
     return config.get('hue', {})
 
@@ -188,17 +183,14 @@ async def main():
 
     beat_count = 0
 
-    # Handle shutdown
-    shutdown_event = asyncio.Event()
-
-    def signal_handler():
-        shutdown_event.set()
-
-    loop.add_signal_handler(signal.SIGINT, signal_handler)
-    loop.add_signal_handler(signal.SIGTERM, signal_handler)
+    # Handle shutdown: cancel the main task directly so a pending
+    # link.sync() wakes immediately
+    main_task = asyncio.current_task()
+    loop.add_signal_handler(signal.SIGINT, main_task.cancel)
+    loop.add_signal_handler(signal.SIGTERM, main_task.cancel)
 
     try:
-        while not shutdown_event.is_set():
+        while True:
             # Wait for next beat
             beat = await link.sync(1)
             beat_count += 1
@@ -4,6 +4,8 @@ Uses MIDI Clock output from Ableton (works with Tempo Follower enabled).
 Supports two modes: Flash (simple beat flash) and Effects (waveform-based LFOs).
 """
 
+import collections
+import functools
 import os
 import select
 import signal
@@ -13,14 +15,23 @@ import termios
 import threading
 import time
 import tty
-import yaml
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Dict
 
-import mido
+import numpy as np
+import rtmidi
 
 from dj_hue.lights.effects import EffectsEngine
 
+try:
+    import tomllib
+except ImportError:  # Python 3.10: no stdlib TOML parser, YAML only
+    tomllib = None
+
+# Repo-root directory holding config.toml / config.yaml, resolved once at import
+CONFIG_DIR = Path(__file__).resolve().parents[3]
+
 # Modes
 MODE_FLASH = "flash"
 MODE_EFFECTS = "effects"
@@ -180,41 +191,126 @@ TICKS_PER_BEAT = 24
 # Adjust this value to compensate for Hue latency (try 2-5)
 ANTICIPATION_TICKS = 6
 
+# Render-loop timing/RGB-jump diagnostics (DJ_HUE_DEBUG=1, as in dj-hue)
+DEBUG = os.environ.get("DJ_HUE_DEBUG", "").lower() in ("1", "true", "yes")
+
 # Render thread runs at 25 Hz to match Zigbee transmission rate
 # Higher rates cause queue buildup in hue-entertainment-pykit
 # Stream at 50 Hz - Philips recommends this to compensate for UDP packet loss
 # The bridge only processes at 25 Hz, but the redundancy prevents dropped frames
 RENDER_HZ = 50
 RENDER_INTERVAL = 1.0 / RENDER_HZ
+RENDER_PERIOD_NS = 1_000_000_000 // RENDER_HZ
+
+# SCHED_FIFO priority for the render thread (modest: above normal threads,
+# below kernel/audio threads)
+RENDER_RT_PRIORITY = 10
+
+# Longest the render thread waits at startup for the streaming library's
+# input thread to exit before taking over the socket
+LIBRARY_THREAD_JOIN_TIMEOUT = 0.2
+
+# MIDI system real-time / common status bytes
+MIDI_CLOCK = 0xF8
+MIDI_START = 0xFA
+MIDI_CONTINUE = 0xFB
+MIDI_STOP = 0xFC
+MIDI_SONG_POSITION = 0xF2
 
 
 class BeatState:
-    """Thread-safe shared state between MIDI and render threads."""
+    """Shared state between MIDI and render threads.
+
+    Lock-free: every field has a single writer (the MIDI/keyboard thread) and
+    is published with one attribute store, which is atomic under the GIL.
+
+    Everything the render thread needs per frame is published as one
+    immutable ``snapshot`` tuple of (beat_position, monotonic_ns, bpm,
+    flash_color), so a single read always sees a consistent set. The
+    timing anchor is republished once per beat rather than on every clock
+    tick; the render thread extrapolates the current position from it (see
+    ``current_beat_position``). An anchor time of 0 means the clock is not
+    running and the position is held.
+    """
 
     def __init__(self):
-        self.lock = threading.Lock()
-        self.beat_position = 0.0
-        self.bpm = 120.0
-        self.beat_count = 0
+        self.snapshot: tuple[float, int, float, tuple[int, int, int]] = (
+            0.0, 0, 120.0, (20, 20, 20)
+        )
         self.running = True
         # Mode state
         self.mode = MODE_FLASH
         self.unified_mode = True
         # Flash mode state
-        self.flash_color = (20, 20, 20)  # Current color for flash mode
         self.flash_triggered = False
 
+    def publish_anchor(self, beat_position: float, anchor_ns: int, bpm: float) -> None:
+        """Publish a new timing anchor, keeping the current flash color."""
+        self.snapshot = (beat_position, anchor_ns, bpm, self.snapshot[3])
+
+    def publish_flash_color(self, color: tuple[int, int, int]) -> None:
+        """Publish a new flash mode color, keeping the current timing anchor."""
+        self.snapshot = self.snapshot[:3] + (color,)
+
+
+# Gamma 2.2 lookup table: 8-bit channel value -> 16-bit gamma-corrected value.
+# Gamma correction makes fades perceptually linear. Without it, LED fades
+# look like they rush through dark values and stall in bright values.
+GAMMA = 2.2
+GAMMA16 = np.array(
+    [int(((i / 255.0) ** GAMMA) * 65535) for i in range(256)], dtype=np.uint16
+)
+
+# Fixed part of every HueStream v2 RGB message header, built once at import:
+# protocol name, version 2.0, sequence id, reserved, color space (RGB),
+# reserved. The entertainment area id follows it.
+HUESTREAM_HEADER_PREFIX = (
+    b"HueStream"
+    + struct.pack(">BBB", 0x02, 0x00, 0x07)
+    + b"\x00\x00"
+    + struct.pack(">B", 0x00)
+    + b"\x00"
+)
+
+# Per-light record in a HueStream v2 RGB message: channel id + big-endian RGB16
+LIGHT_FRAME_DTYPE = np.dtype(
+    [("channel", "u1"), ("r", ">u2"), ("g", ">u2"), ("b", ">u2")]
+)
+
+
+def current_beat_position(snapshot: tuple) -> tuple[float, float]:
+    """Extrapolate (beat_position, bpm) from a BeatState snapshot's timing anchor.
+
+    Never runs past the next beat boundary, so a late or stopped clock holds
+    position instead of drifting ahead of the MIDI clock.
+    """
+    anchor_pos, anchor_ns, bpm, _ = snapshot
+    if not anchor_ns:
+        return anchor_pos, bpm
+    elapsed_beats = (time.monotonic_ns() - anchor_ns) * bpm / 60e9
+    return min(anchor_pos + elapsed_beats, int(anchor_pos) + 1.0), bpm
 
-def rgb_to_rgb16(r: float, g: float, b: float, gamma: float = 2.2) -> tuple[int, int, int]:
-    """Convert RGB floats (0.0-1.0) to RGB16 (0-65535) with gamma correction.
 
-    Gamma correction makes fades perceptually linear. Without it, LED fades
-    look like they rush through dark values and stall in bright values.
+def raise_render_priority() -> None:
+    """Give the calling (render) thread real-time scheduling where possible.
+
+    Uses SCHED_FIFO on Linux, which needs CAP_SYS_NICE or an RLIMIT_RTPRIO
+    allowance (e.g. ``ulimit -r 20``). Falls back to a negative nice value,
+    and otherwise leaves the default priority alone.
     """
-    r = max(0.0, min(1.0, r)) ** gamma
-    g = max(0.0, min(1.0, g)) ** gamma
-    b = max(0.0, min(1.0, b)) ** gamma
-    return (int(r * 65535), int(g * 65535), int(b * 65535))
+    if hasattr(os, "sched_setscheduler"):
+        try:
+            # pid 0 = calling thread on Linux
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(RENDER_RT_PRIORITY))
+            print(f"[RENDER] Real-time priority enabled (SCHED_FIFO {RENDER_RT_PRIORITY})")
+            return
+        except (OSError, AttributeError):
+            pass
+    try:
+        os.nice(-10)
+        print("[RENDER] Raised priority (nice -10)")
+    except OSError:
+        print("[RENDER] Running at normal priority (no permission to raise it)")
 
 
 def render_loop(
@@ -238,202 +334,317 @@ def render_loop(
     # They send on the same socket which could cause conflicts
     print("[RENDER] Stopping library's background threads...")
     streaming_service._is_connection_alive = False  # Signal threads to stop
-    # Wait for them to finish (they check this flag in their loops)
-    import time as time_module
-    time_module.sleep(1.5)  # Give threads time to exit (queue timeout is 1 second)
+    # Give the input thread a short window to see the flag instead of sleeping
+    # out its full 1 s queue timeout. If it is still blocked in get() it stays
+    # idle anyway: nothing below feeds its queue. The keep-alive thread sleeps
+    # ~10 s between sends and only ever resends _last_message (our packet).
+    input_thread = getattr(streaming_service, "_processing_thread", None)
+    if input_thread is not None:
+        join_deadline = time.monotonic() + LIBRARY_THREAD_JOIN_TIMEOUT
+        while input_thread.is_alive() and time.monotonic() < join_deadline:
+            input_thread.join(timeout=0.05)
     streaming_service._is_connection_alive = True  # Re-enable for our use
     print("[RENDER] Library threads stopped, we have exclusive socket access")
 
-    # Debug: Print what the library's header looks like
-    lib_header = (
-        streaming_service._protocol_name
-        + streaming_service._version
-        + streaming_service._sequence_id
-        + streaming_service._reserved
-        + streaming_service._color_space
-        + streaming_service._reserved2
-        + streaming_service._entertainment_id
-    )
-    print(f"[DEBUG] Library header ({len(lib_header)} bytes): {lib_header.hex()}")
-
-    # Pre-build the message header (same for all messages)
-    protocol_name = "HueStream".encode("utf-8")
-    version = struct.pack(">BB", 0x02, 0x00)
-    sequence_id = struct.pack(">B", 0x07)
-    reserved = b"\x00\x00"
-    color_space = struct.pack(">B", 0x00)  # RGB
-    reserved2 = b"\x00"
-    entertainment_id = streaming_service._entertainment_config.id.encode("utf-8")
+    raise_render_priority()
 
-    header = protocol_name + version + sequence_id + reserved + color_space + reserved2 + entertainment_id
-    print(f"[DEBUG] Our header ({len(header)} bytes): {header.hex()}")
-    print(f"[DEBUG] Headers match: {header == lib_header}")
+    # Message header (same for all messages): fixed prefix + area id
+    entertainment_id = streaming_service._entertainment_config.id.encode("utf-8")
+    header = HUESTREAM_HEADER_PREFIX + entertainment_id
+
+    if DEBUG:
+        # Compare against the library's own header
+        lib_header = (
+            streaming_service._protocol_name
+            + streaming_service._version
+            + streaming_service._sequence_id
+            + streaming_service._reserved
+            + streaming_service._color_space
+            + streaming_service._reserved2
+            + streaming_service._entertainment_id
+        )
+        print(f"[DEBUG] Library header ({len(lib_header)} bytes): {lib_header.hex()}")
+        print(f"[DEBUG] Our header ({len(header)} bytes): {header.hex()}")
+        print(f"[DEBUG] Headers match: {header == lib_header}")
+
+    # Per-frame buffers: 8-bit colors in, packed channel records out.
+    # The channel records are a view into one reusable send buffer that
+    # already holds the header, so no message bytes are allocated per frame.
+    rgb8 = np.zeros((num_lights, 3), dtype=np.uint8)
+    rgb16 = np.zeros((num_lights, 3), dtype=np.uint16)
+    packet = bytearray(len(header) + num_lights * LIGHT_FRAME_DTYPE.itemsize)
+    packet[: len(header)] = header
+    frame = np.frombuffer(packet, dtype=LIGHT_FRAME_DTYPE, offset=len(header))
+    # num_lights is fixed for the session, so the layout is specialized once
+    # here: channel ids never change, and each frame only rewrites the three
+    # color fields in one vectorized pass (no per-light pack calls)
+    frame["channel"] = np.arange(num_lights)
+    # The library's keep-alive thread resends _last_message from its own
+    # thread, so it gets an immutable copy rather than the buffer rewritten here
+    streaming_service._last_message = bytes(packet)
 
     # Timing diagnostics
     frame_count = 0
-    last_report = time.time()
-    last_frame_end = time.time()
+    last_report = time.monotonic()
+    last_frame_start = last_report
 
     # Track gaps and slowdowns
     gap_count = 0
+    dropped_frames = 0
     max_gap = 0.0
     max_send = 0.0
     max_compute = 0.0
-    max_lock = 0.0
 
     # Track RGB values to detect discontinuities
     last_rgb = None
     rgb_jumps = 0  # Count of large RGB changes between frames
 
+    last_frame_key = None  # Uniform color currently packed into packet, if any
+
+    # Bind hot attributes/globals to locals once; the frame body runs at
+    # RENDER_HZ and would otherwise repeat these lookups every frame
+    monotonic = time.monotonic
+    monotonic_ns = time.monotonic_ns
+    sleep = time.sleep
+    poll_writable = select.select
+    send = dtls_socket.send
+    take = np.take
+    beat_clock = effects_engine.beat_clock
+    compute_colors_into = effects_engine.compute_colors_into
+    compute_unified_color = effects_engine.compute_unified_color
+    # Field views write straight into packet; column views read rgb16
+    frame_r, frame_g, frame_b = frame["r"], frame["g"], frame["b"]
+    rgb16_r, rgb16_g, rgb16_b = rgb16[:, 0], rgb16[:, 1], rgb16[:, 2]
+    gap_threshold_ms = RENDER_INTERVAL * 1000 * 1.5  # More than 50% over expected
+
+    # Absolute-deadline scheduling on the monotonic clock: each frame is due
+    # exactly RENDER_PERIOD_NS after the previous one, so sleep overshoot
+    # doesn't accumulate into drift
+    deadline_ns = monotonic_ns()
+
     while beat_state.running:
-        frame_start = time.time()
-
-        # Check gap since last frame
-        gap = (frame_start - last_frame_end) * 1000
-        if gap > RENDER_INTERVAL * 1000 * 1.5:  # More than 50% over expected
-            gap_count += 1
-        max_gap = max(max_gap, gap)
-
-        # Time lock acquisition
-        lock_start = time.time()
-        with beat_state.lock:
-            mode = beat_state.mode
-            unified = beat_state.unified_mode
-            beat_pos = beat_state.beat_position
-            bpm = beat_state.bpm
-            flash_color = beat_state.flash_color
-        lock_time = (time.time() - lock_start) * 1000
-        max_lock = max(max_lock, lock_time)
-
-        # Time computation
-        compute_start = time.time()
-
-        # Update effects engine outside the lock
-        effects_engine.beat_clock.beat_position = beat_pos
-        effects_engine.beat_clock.bpm = bpm
-
-        # Compute colors for all lights
+        if DEBUG:
+            frame_start = monotonic()
+
+            # Check gap since last frame started
+            gap = (frame_start - last_frame_start) * 1000
+            last_frame_start = frame_start
+            if gap > gap_threshold_ms:
+                gap_count += 1
+            max_gap = max(max_gap, gap)
+
+        # Read shared state (single reads, no lock)
+        mode = beat_state.mode
+        unified = beat_state.unified_mode
+        snapshot = beat_state.snapshot
+        beat_pos, bpm = current_beat_position(snapshot)
+        flash_color = snapshot[3]
+
+        if DEBUG:
+            compute_start = monotonic()
+
+        # Update effects engine
+        beat_clock.beat_position = beat_pos
+        beat_clock.bpm = bpm
+
+        # Compute colors for all lights. When every light shares one color,
+        # that color is the frame key: if it matches the last frame, the
+        # packed packet is still valid and is re-sent as-is.
         if mode == MODE_EFFECTS:
             if unified:
-                rgb = effects_engine.compute_unified_color()
-                light_colors = [(rgb.r / 255.0, rgb.g / 255.0, rgb.b / 255.0)] * num_lights
+                rgb = compute_unified_color()
+                frame_key = (rgb.r, rgb.g, rgb.b)
             else:
-                colors = effects_engine.compute_colors()
-                light_colors = []
-                for channel_id in range(num_lights):
-                    rgb_val = colors.get(channel_id, effects_engine.compute_unified_color())
-                    light_colors.append((rgb_val.r / 255.0, rgb_val.g / 255.0, rgb_val.b / 255.0))
+                frame_key = None
+                # Engine fills the (N, 3) uint8 buffer the packer reads
+                compute_colors_into(rgb8)
         else:
             # Flash mode - same color for all
-            light_colors = [(flash_color[0] / 255.0, flash_color[1] / 255.0, flash_color[2] / 255.0)] * num_lights
+            frame_key = flash_color
 
-        compute_time = (time.time() - compute_start) * 1000
-        max_compute = max(max_compute, compute_time)
+        if DEBUG:
+            send_start = monotonic()
+            max_compute = max(max_compute, (send_start - compute_start) * 1000)
 
         # Send ALL lights in a single batched message for synchronized updates
-        send_start = time.time()
-        all_channels_data = b""
-        for channel_id, (r, g, b) in enumerate(light_colors):
-            r16, g16, b16 = rgb_to_rgb16(r, g, b)
-            all_channels_data += struct.pack(">B", channel_id) + struct.pack(">HHH", r16, g16, b16)
-        message = header + all_channels_data
+        # Gamma + packing run as NumPy C loops into preallocated buffers, and
+        # socket.send() releases the GIL, so the MIDI thread isn't starved
+        if frame_key is None or frame_key != last_frame_key:
+            if frame_key is not None:
+                rgb8[:] = frame_key
+            take(GAMMA16, rgb8, out=rgb16)
+            frame_r[:] = rgb16_r
+            frame_g[:] = rgb16_g
+            frame_b[:] = rgb16_b
+            last_frame_key = frame_key
+            streaming_service._last_message = bytes(packet)
+        # Drop, don't queue: a frame that can't be sent immediately is
+        # already stale by the next tick. The socket itself stays blocking,
+        # since the library's keep-alive thread shares it and treats any
+        # send error (EAGAIN included) as a lost connection.
         try:
-            dtls_socket.send(message)
+            if poll_writable((), (dtls_socket,), (), 0)[1]:
+                send(packet)
+            else:
+                dropped_frames += 1
         except Exception as e:
             print(f"\n[RENDER] Send error: {e}")
-        streaming_service._last_message = message  # For library's keep-alive
-        send_time = (time.time() - send_start) * 1000
-        max_send = max(max_send, send_time)
-
-        # Track RGB continuity - detect large jumps that would appear as flicker
-        current_rgb = light_colors[0] if light_colors else (0, 0, 0)
-        if last_rgb is not None:
-            # Calculate max change in any channel
-            max_change = max(
-                abs(current_rgb[0] - last_rgb[0]),
-                abs(current_rgb[1] - last_rgb[1]),
-                abs(current_rgb[2] - last_rgb[2]),
-            )
-            # A jump > 0.3 (30% brightness change) in one frame would be noticeable
-            if max_change > 0.3:
-                rgb_jumps += 1
-                print(f"\n[JUMP] RGB changed by {max_change:.2f}: {last_rgb} -> {current_rgb}")
-        last_rgb = current_rgb
-
-        frame_count += 1
-
-        # Report every 5 seconds
-        now = time.time()
-        if now - last_report >= 5.0:
-            print(f"\n[TIMING] frames={frame_count} gaps={gap_count} jumps={rgb_jumps} | max: gap={max_gap:.1f}ms lock={max_lock:.1f}ms compute={max_compute:.1f}ms send={max_send:.1f}ms")
-            rgb_jumps = 0
-            frame_count = 0
-            gap_count = 0
-            max_gap = 0.0
-            max_send = 0.0
-            max_compute = 0.0
-            max_lock = 0.0
-            last_report = now
-
-        # Precise timing
-        elapsed = time.time() - frame_start
-        sleep_time = RENDER_INTERVAL - elapsed
-        if sleep_time > 0:
-            time.sleep(sleep_time)
-
-        last_frame_end = time.time()
+            # The keep-alive thread may have reconnected on a new socket
+            dtls_socket = streaming_service._dtls_service.get_socket()
+            send = dtls_socket.send
+
+        if DEBUG:
+            now = monotonic()
+            max_send = max(max_send, (now - send_start) * 1000)
+
+            # Track RGB continuity - detect large jumps that would appear as flicker
+            current_rgb = tuple(rgb8[0].tolist()) if num_lights else (0, 0, 0)
+            if last_rgb is not None:
+                # Calculate max change in any channel
+                max_change = max(
+                    abs(current_rgb[0] - last_rgb[0]),
+                    abs(current_rgb[1] - last_rgb[1]),
+                    abs(current_rgb[2] - last_rgb[2]),
+                )
+                # A jump > 30% brightness change (76/255) in one frame would be noticeable
+                if max_change > 76:
+                    rgb_jumps += 1
+                    print(f"\n[JUMP] RGB changed by {max_change}: {last_rgb} -> {current_rgb}")
+            last_rgb = current_rgb
+
+            frame_count += 1
+
+            # Report every 5 seconds
+            if now - last_report >= 5.0:
+                print(f"\n[TIMING] frames={frame_count} gaps={gap_count} dropped={dropped_frames} jumps={rgb_jumps} | max: gap={max_gap:.1f}ms compute={max_compute:.1f}ms send={max_send:.1f}ms")
+                rgb_jumps = 0
+                frame_count = 0
+                gap_count = 0
+                dropped_frames = 0
+                max_gap = 0.0
+                max_send = 0.0
+                max_compute = 0.0
+                last_report = now
+
+        # Sleep until the next absolute deadline; after an overrun, restart
+        # the schedule from now instead of bursting to catch up
+        deadline_ns += RENDER_PERIOD_NS
+        slack_ns = deadline_ns - monotonic_ns()
+        if slack_ns > 0:
+            sleep(slack_ns / 1e9)
+        else:
+            deadline_ns = monotonic_ns()
 
     print("[RENDER] Stopped")
 
 
+@functools.cache
 def load_config():
-    """Load Hue config from config.yaml."""
-    config_path = os.path.join(os.path.dirname(__file__), "..", "..", "..", "config.yaml")
+    """Load Hue config, preferring config.toml and falling back to config.yaml.
 
-    if not os.path.exists(config_path):
+    The file is read once per process; later calls return the cached dict.
+    """
+    toml_path = CONFIG_DIR / "config.toml"
+    if tomllib is not None and toml_path.exists():
+        with toml_path.open("rb") as f:
+            config = tomllib.load(f)
+        return config.get("hue", {})
+
+    config_path = CONFIG_DIR / "config.yaml"
+    if not config_path.exists():
         raise FileNotFoundError(
             f"Config not found: {config_path}\n" "Run 'dj-hue --setup' first."
         )
 
-    with open(config_path, "r") as f:
-        config = yaml.safe_load(f)
+    # Only pay PyYAML's import cost when there is no TOML config
+    import yaml
+
+    config = yaml.safe_load(config_path.read_text(encoding="utf-8"))
 
     return config.get("hue", {})
 
 
+class MidiClockInput:
+    """Virtual MIDI input port fed by rtmidi's native callback.
+
+    The callback runs on rtmidi's thread and only queues the raw message and
+    pokes a wake-up pipe, so the main loop can ``select`` on MIDI and stdin
+    together instead of blocking in ``receive()`` or polling. The same pipe
+    is poked on shutdown (see ``wake``), so that ``select`` needs no timeout.
+    """
+
+    def __init__(self, port_name: str):
+        self.port_name = port_name
+        self.events: collections.deque[list[int]] = collections.deque()
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        self._midi_in = None
+
+    def __enter__(self) -> "MidiClockInput":
+        self._midi_in = rtmidi.MidiIn()
+        # rtmidi drops timing messages (MIDI Clock) unless told otherwise
+        self._midi_in.ignore_types(sysex=True, timing=False, active_sense=True)
+        self._midi_in.open_virtual_port(self.port_name)
+        self._midi_in.set_callback(self._on_message)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._midi_in is not None:
+            self._midi_in.cancel_callback()
+            self._midi_in.close_port()
+            self._midi_in = None
+        os.close(self._wake_r)
+        os.close(self._wake_w)
+
+    def _on_message(self, event, data=None) -> None:
+        """rtmidi callback: queue the raw bytes and wake the main loop."""
+        self.events.append(event[0])
+        self.wake()
+
+    def wake(self) -> None:
+        """Make the wake-up pipe readable (safe from signal handlers)."""
+        try:
+            os.write(self._wake_w, b"\0")
+        except BlockingIOError:
+            pass  # Pipe full: a wake-up is already pending
+        except OSError:
+            pass  # Already closed: nothing left waiting on it
+
+    def fileno(self) -> int:
+        """File descriptor that becomes readable when MIDI arrives."""
+        return self._wake_r
+
+    def clear_wakeups(self) -> None:
+        """Drain pending wake-up bytes (call before consuming events)."""
+        try:
+            while os.read(self._wake_r, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+
 class KeyboardListener:
-    """Non-blocking keyboard input listener."""
+    """Non-blocking keyboard input, selected on from the main MIDI loop."""
 
     def __init__(self):
-        self.last_key = None
-        self._running = False
-        self._thread = None
         self._old_settings = None
 
     def start(self):
-        """Start listening for keyboard input."""
-        self._running = True
+        """Put the terminal in cbreak mode for single-key input."""
         self._old_settings = termios.tcgetattr(sys.stdin)
         tty.setcbreak(sys.stdin.fileno())
-        self._thread = threading.Thread(target=self._listen, daemon=True)
-        self._thread.start()
-
-    def _listen(self):
-        """Listen for keypresses in background thread."""
-        while self._running:
-            if select.select([sys.stdin], [], [], 0.1)[0]:
-                key = sys.stdin.read(1)
-                self.last_key = key
-
-    def get_key(self):
-        """Get last pressed key (or None)."""
-        key = self.last_key
-        self.last_key = None
-        return key
+
+    def fileno(self) -> int:
+        """File descriptor to wait on for keypresses."""
+        return sys.stdin.fileno()
+
+    def read_key(self) -> str:
+        """Read one pressed key (call once stdin is readable)."""
+        return sys.stdin.read(1)
 
     def stop(self):
-        """Stop listening and restore terminal."""
-        self._running = False
+        """Restore terminal."""
         if self._old_settings:
             termios.tcsetattr(sys.stdin, termios.TCSADRAIN, self._old_settings)
 
@@ -480,9 +691,12 @@ def main():
     print()
 
     keyboard = KeyboardListener()
+    midi_in = MidiClockInput(port_name)
 
     def signal_handler(sig, frame):
         beat_state.running = False
+        # The main loop blocks in select() without a timeout; wake it
+        midi_in.wake()
         print("\n[SHUTDOWN] Stopping...")
 
     signal.signal(signal.SIGINT, signal_handler)
@@ -491,11 +705,12 @@ def main():
     try:
         keyboard.start()
 
-        with mido.open_input(port_name, virtual=True) as port:
+        with midi_in:
             tick_count = 0
             beat_count = 0
             last_beat_time = time.time()
             current_bpm = 120.0
+            anchored = False  # Whether the render thread has a live timing anchor
 
             print(f"[MIDI] Listening on '{port_name}'...")
             print("[MIDI] Waiting for MIDI Clock from Ableton...")
@@ -503,27 +718,24 @@ def main():
             print()
 
             while beat_state.running:
-                # Check for keyboard input
-                key = keyboard.get_key()
+                # Sleep until MIDI, keyboard input or a shutdown wake-up arrives
+                ready = select.select([midi_in, keyboard], [], [])[0]
+                key = keyboard.read_key() if keyboard in ready else None
                 if key:
                     if key == "q":
                         beat_state.running = False
                         break
                     elif key == "e":
                         # Toggle mode
-                        with beat_state.lock:
-                            beat_state.mode = (
-                                MODE_EFFECTS if beat_state.mode == MODE_FLASH else MODE_FLASH
-                            )
-                            mode = beat_state.mode
+                        mode = MODE_EFFECTS if beat_state.mode == MODE_FLASH else MODE_FLASH
+                        beat_state.mode = mode
                         print(f"\n[MODE] Switched to {mode.upper()}")
                         if mode == MODE_EFFECTS:
                             print(f"[PATTERN] {effects_engine.current_pattern_name}")
                     elif key == "u":
                         # Toggle unified mode
-                        with beat_state.lock:
-                            beat_state.unified_mode = not beat_state.unified_mode
-                            unified = beat_state.unified_mode
+                        unified = not beat_state.unified_mode
+                        beat_state.unified_mode = unified
                         mode_str = "ON (all same)" if unified else "OFF (per-light)"
                         print(f"\n[UNIFIED] {mode_str}")
                     elif key == "p" and beat_state.mode == MODE_EFFECTS:
@@ -538,87 +750,87 @@ def main():
                             effects_engine.set_pattern(pattern_names[idx])
                             print(f"\n[PATTERN] {pattern_names[idx]}")
 
-                # Non-blocking receive with timeout
-                msg = port.receive(block=True)
-
-                if msg is None:
-                    continue
+                # Handle every MIDI message queued by the rtmidi callback
+                midi_in.clear_wakeups()
+                while midi_in.events:
+                    message = midi_in.events.popleft()
+                    status = message[0]
+
+                    if status == MIDI_CLOCK:
+                        # First: advance tick_count and handle beat boundary
+                        # This must happen BEFORE calculating beat_position to avoid
+                        # a race condition where position briefly jumps backward
+                        tick_count += 1
+                        if tick_count >= TICKS_PER_BEAT:
+                            tick_count = 0
+                            beat_count += 1
+                            now = time.time()
+
+                            # Calculate BPM from beat timing
+                            beat_duration = now - last_beat_time
+                            if beat_duration > 0 and last_beat_time > 0:
+                                current_bpm = 60.0 / beat_duration
+                            last_beat_time = now
+
+                            # Beat position in bar (1-4)
+                            beat_in_bar = ((beat_count - 1) % 4) + 1
+                            bar = (beat_count - 1) // 4 + 1
+
+                            # Print beat info
+                            mode_str = (
+                                f"{beat_state.mode.upper()}"
+                                if beat_state.mode == MODE_FLASH
+                                else f"{effects_engine.current_pattern_name}"
+                            )
+                            print(
+                                f"\r[BEAT] Bar {bar} Beat {beat_in_bar} | "
+                                f"{current_bpm:.1f} BPM | {mode_str}        ",
+                                end="",
+                                flush=True,
+                            )
 
-                if msg.type == "clock":
-                    # First: advance tick_count and handle beat boundary
-                    # This must happen BEFORE calculating beat_position to avoid
-                    # a race condition where position briefly jumps backward
-                    tick_count += 1
-                    if tick_count >= TICKS_PER_BEAT:
+                        # Now calculate beat_position with consistent tick/beat values
+                        beat_position = beat_count + tick_count / TICKS_PER_BEAT
+
+                        # Publish a timing anchor once per beat (or on the first tick
+                        # after a transport change); the render thread extrapolates
+                        # between anchors, so per-tick publication isn't needed
+                        if tick_count == 0 or not anchored:
+                            beat_state.publish_anchor(beat_position, time.monotonic_ns(), current_bpm)
+                            anchored = True
+
+                        # Flash mode: update color on beat (with anticipation)
+                        if beat_state.mode == MODE_FLASH:
+                            trigger_tick = TICKS_PER_BEAT - ANTICIPATION_TICKS
+                            if tick_count == trigger_tick:
+                                next_beat = beat_count + 1
+                                bar = (next_beat - 1) // 4 + 1
+                                color_idx = (bar - 1) % len(COLORS)
+                                beat_state.publish_flash_color(COLORS[color_idx])
+
+                    elif status == MIDI_START:
+                        print("\n[MIDI] Start received - resetting to beat 1")
                         tick_count = 0
-                        beat_count += 1
-                        now = time.time()
-
-                        # Calculate BPM from beat timing
-                        beat_duration = now - last_beat_time
-                        if beat_duration > 0 and last_beat_time > 0:
-                            current_bpm = 60.0 / beat_duration
-                        last_beat_time = now
-
-                        # Beat position in bar (1-4)
-                        beat_in_bar = ((beat_count - 1) % 4) + 1
-                        bar = (beat_count - 1) // 4 + 1
-
-                        # Print beat info
-                        mode_str = (
-                            f"{beat_state.mode.upper()}"
-                            if beat_state.mode == MODE_FLASH
-                            else f"{effects_engine.current_pattern_name}"
-                        )
-                        print(
-                            f"\r[BEAT] Bar {bar} Beat {beat_in_bar} | "
-                            f"{current_bpm:.1f} BPM | {mode_str}        ",
-                            end="",
-                            flush=True,
+                        beat_count = 0
+                        last_beat_time = 0
+                        beat_state.publish_anchor(0.0, 0, current_bpm)
+                        anchored = False
+
+                    elif status == MIDI_STOP:
+                        print("\n[MIDI] Stop received")
+                        beat_state.snapshot = (
+                            beat_count + tick_count / TICKS_PER_BEAT, 0, current_bpm, (20, 20, 20)
                         )
+                        anchored = False
+
+                    elif status == MIDI_CONTINUE:
+                        print("\n[MIDI] Continue received")
 
-                    # Now calculate beat_position with consistent tick/beat values
-                    beat_position = beat_count + tick_count / TICKS_PER_BEAT
-
-                    # Update shared state (render thread reads this)
-                    with beat_state.lock:
-                        beat_state.beat_position = beat_position
-                        beat_state.bpm = current_bpm
-                        beat_state.beat_count = beat_count
-
-                    # Flash mode: update color on beat (with anticipation)
-                    if beat_state.mode == MODE_FLASH:
-                        trigger_tick = TICKS_PER_BEAT - ANTICIPATION_TICKS
-                        if tick_count == trigger_tick:
-                            next_beat = beat_count + 1
-                            bar = (next_beat - 1) // 4 + 1
-                            color_idx = (bar - 1) % len(COLORS)
-                            with beat_state.lock:
-                                beat_state.flash_color = COLORS[color_idx]
-
-                elif msg.type == "start":
-                    print("\n[MIDI] Start received - resetting to beat 1")
-                    tick_count = 0
-                    beat_count = 0
-                    last_beat_time = 0
-                    with beat_state.lock:
-                        beat_state.beat_position = 0.0
-                        beat_state.beat_count = 0
-
-                elif msg.type == "stop":
-                    print("\n[MIDI] Stop received")
-                    with beat_state.lock:
-                        beat_state.flash_color = (20, 20, 20)
-
-                elif msg.type == "continue":
-                    print("\n[MIDI] Continue received")
-
-                elif msg.type == "songpos":
-                    position = msg.pos
-                    beat_count = position // 4
-                    with beat_state.lock:
-                        beat_state.beat_count = beat_count
-                    print(f"\n[MIDI] Position: beat {beat_count}")
+                    elif status == MIDI_SONG_POSITION and len(message) >= 3:
+                        position = message[1] | (message[2] << 7)
+                        beat_count = position // 4
+                        anchored = False
+                        print(f"\n[MIDI] Position: beat {beat_count}")
 
     except Exception as e:
         print(f"\n[ERROR] {e}")
@@ -4,7 +4,11 @@ Uses MIDI Clock output from Ableton (works with Tempo Follower enabled).
 Integrates with the PatternEngine for pattern-based lighting control.
 """
 
+import codecs
+import collections
+import functools
 import os
+import re
 import select
 import signal
 import struct
@@ -19,10 +23,20 @@ from pathlib import Path
 from typing import Optional
 
 import mido
+import numpy as np
 
 from dj_hue.patterns import PatternEngine, LightSetup, LightGroup, QuickAction
+from dj_hue.patterns.strudel.palettes import get_palette
 from dj_hue.control.server import ControlServer
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
+# Repo-root config.yaml, resolved once at import
+CONFIG_PATH = Path(__file__).resolve().parents[3] / "config.yaml"
+
 
 # Render thread runs at 50 Hz to match Zigbee transmission rate
 RENDER_HZ = 50
@@ -31,9 +45,67 @@ RENDER_INTERVAL = 1.0 / RENDER_HZ
 # MIDI Clock sends 24 ticks per quarter note (beat)
 TICKS_PER_BEAT = 24
 
+# Fraction of a beat elapsed after each tick count (one extra entry guards
+# the wrap-around boundary)
+_TICK_FRAC = tuple(i / TICKS_PER_BEAT for i in range(TICKS_PER_BEAT + 1))
+
 # Anticipation: trigger lights this many ticks BEFORE the beat
 ANTICIPATION_TICKS = 6
 
+# Unchanged frames are not re-sent; the bridge holds the last state. One is
+# still sent at least this often so the stream never looks idle.
+RESEND_INTERVAL = 1.0
+
+# The stream is unacknowledged UDP, so a new frame is repeated at the full
+# render rate for this many sends (~100 ms) before suppression kicks in;
+# otherwise one lost packet on a transition that then holds (blackout, a
+# fade reaching 0, a static pattern) would leave stale colors for up to
+# RESEND_INTERVAL.
+RESEND_BURST = 5
+
+# Verbose render-loop diagnostics (DJ_HUE_DEBUG=1). Read once at import so the
+# per-frame checks are a constant global lookup; with it off, the render loop
+# skips the beat-stuck and light-state tracking entirely.
+LOG_DIAGNOSTICS = os.environ.get("DJ_HUE_DEBUG", "").lower() in ("1", "true", "yes")
+
+# Brightness zones, in EngineState.zone_brightness_arr slot order
+ZONE_NAMES = ("ceiling", "perimeter", "ambient")
+
+# SCHED_FIFO priority for the render thread (modest: above normal threads,
+# below kernel/audio threads)
+RENDER_RT_PRIORITY = 20
+
+# GIL hand-off interval while the render thread runs. A render thread waking
+# from its sleep waits up to this long for another thread to release the GIL
+# (CPython's default is 5 ms, a quarter of a frame).
+GIL_SWITCH_INTERVAL = 0.001
+
+# Gamma applied to outgoing colors (see rgb_to_rgb16)
+GAMMA = 2.2
+
+# Gamma lookup table for the render loop: 0.0-1.0 -> gamma-corrected RGB16.
+# 16 steps per 8-bit level, so undimmed 8-bit colors hit exact entries and
+# dimmed/faded colors still get 12-bit resolution.
+GAMMA_LUT_STEPS = 255 * 16
+GAMMA16_LUT = np.array(
+    [int(((i / GAMMA_LUT_STEPS) ** GAMMA) * 65535) for i in range(GAMMA_LUT_STEPS + 1)],
+    dtype=np.uint16,
+)
+
+# Fixed part of every HueStream v2 RGB message header, built once at import:
+# protocol name, version 2.0, sequence id, reserved, color space (RGB),
+# reserved. The entertainment area id follows it.
+HUESTREAM_HEADER_PREFIX = (
+    b"HueStream"
+    + struct.pack(">BBB", 0x02, 0x00, 0x07)
+    + b"\x00\x00"
+    + struct.pack(">B", 0x00)
+    + b"\x00"
+)
+
+# Per-light record in a HueStream v2 RGB message: API channel id + big-endian RGB16
+LIGHT_FRAME_DTYPE = np.dtype([("channel", "u1"), ("rgb", ">u2", (3,))])
+
 
 @dataclass
 class LightState:
@@ -108,18 +180,17 @@ class HueStreamer:
         # Build light name/ID lookup for matching against light_order config
         light_names, rid_to_device = get_light_names(self.bridge_ip, self.username)
 
-        # Build list of (api_channel_index, light_name, light_rid, device_id) for ordering
+        # Build list of (api_channel_index, light_name, light_rid, device_id) for ordering,
+        # plus api_channel_index -> (light_name, light_rid, device_id) of its first member
         api_channels_info = []
-        rid_to_api_channels: dict[str, list[int]] = {}
+        api_info: dict[int, tuple[str, str, str]] = {}
         for api_idx, channel in enumerate(target_config.channels):
             for member in channel.members:
                 rid = member.service.rid
                 name = light_names.get(rid, "Unknown")
                 device_id = rid_to_device.get(rid, rid)  # Fall back to RID if no device
                 api_channels_info.append((api_idx, name, rid, device_id))
-                if rid not in rid_to_api_channels:
-                    rid_to_api_channels[rid] = []
-                rid_to_api_channels[rid].append(api_idx)
+                api_info.setdefault(api_idx, (name, rid, device_id))
 
         # Apply light_order if configured
         if self.light_order:
@@ -164,13 +235,9 @@ class HueStreamer:
         device_to_our_channels: dict[str, list[int]] = {}
         for our_idx in range(self._num_channels):
             api_idx = self._channel_to_api_channel[our_idx]
-            # Find device ID for this API channel
-            for a_idx, name, rid, device_id in api_channels_info:
-                if a_idx == api_idx:
-                    if device_id not in device_to_our_channels:
-                        device_to_our_channels[device_id] = []
-                    device_to_our_channels[device_id].append(our_idx)
-                    break
+            if api_idx in api_info:
+                _, _, device_id = api_info[api_idx]
+                device_to_our_channels.setdefault(device_id, []).append(our_idx)
 
         # Build groups: "strip" for multi-segment devices, "lamps" for single-segment
         strip_channels = []
@@ -198,27 +265,26 @@ class HueStreamer:
         self._light_groups["lamps_odd"] = [c for c in self._light_groups["lamps"] if c % 2 == 1]
         self._light_groups["lamps_even"] = [c for c in self._light_groups["lamps"] if c % 2 == 0]
 
+        # Invert the groups once: channel index -> names of groups containing it
+        idx_to_groups: list[list[str]] = [[] for _ in range(self._num_channels)]
+        for group_name, indices in self._light_groups.items():
+            for i in indices:
+                idx_to_groups[i].append(group_name)
+
         # Build light info for settings UI
         self._light_info = []
         for our_idx in range(self._num_channels):
             api_idx = self._channel_to_api_channel[our_idx]
-            # Find info for this API channel
-            for a_idx, name, rid, device_id in api_channels_info:
-                if a_idx == api_idx:
-                    # Determine which groups this light belongs to
-                    groups = [
-                        group_name
-                        for group_name, indices in self._light_groups.items()
-                        if our_idx in indices
-                    ]
-                    self._light_info.append({
-                        "rid": rid,
-                        "name": name,
-                        "index": our_idx,
-                        "api_channel": api_idx,
-                        "groups": sorted(groups),
-                    })
-                    break
+            if api_idx not in api_info:
+                continue
+            name, rid, _ = api_info[api_idx]
+            self._light_info.append({
+                "rid": rid,
+                "name": name,
+                "index": our_idx,
+                "api_channel": api_idx,
+                "groups": sorted(idx_to_groups[our_idx]),
+            })
 
         self._streaming = Streaming(self._bridge, target_config, ent_conf_repo)
         self._streaming.set_color_space("rgb")
@@ -266,23 +332,29 @@ class HueStreamer:
 
 
 class EngineState:
-    """Thread-safe shared state between MIDI and render threads."""
+    """Thread-safe shared state between MIDI and render threads.
+
+    Writers (MIDI loop, control server) hold ``lock`` to coordinate with each
+    other. The render thread reads without it: each field is published with
+    a single attribute store, atomic under the GIL, so it never blocks on
+    (or priority-inverts behind) a writer. Writers that set a pair of fields
+    store the one the render thread keys off (``fade_active``,
+    ``identify_light_index``) last. Beat state is a single
+    ``(beat_position, bpm, beat_count)`` tuple, replaced as a whole by
+    ``publish_beat`` so readers always get a consistent triple.
+    """
 
     def __init__(self):
         self.lock = threading.Lock()
-        self.beat_position = 0.0
-        self.bpm = 120.0
-        self.beat_count = 0
+        self.beat_snapshot: tuple[float, float, int] = (0.0, 120.0, 0)
         self.running = True
         # Light identification (for settings UI)
         self.identify_light_index: int | None = None
         self.identify_until: float = 0.0  # time.time() when to stop
-        # Per-zone brightness (0.0-1.0)
-        self.zone_brightness: dict[str, float] = {
-            "ceiling": 1.0,
-            "perimeter": 1.0,
-            "ambient": 1.0,
-        }
+        # Per-zone brightness (0.0-1.0), one slot per ZONE_NAMES entry plus a
+        # trailing 1.0 for lights outside any zone. Slots are overwritten in
+        # place, so the render thread indexes it directly without copying.
+        self.zone_brightness_arr = np.ones(len(ZONE_NAMES) + 1)
         # Fade out state
         self.fade_active: bool = False
         self.fade_start_time: float = 0.0
@@ -292,8 +364,37 @@ class EngineState:
         self.queued_pattern_index: int | None = None
         self.queue_target_bar: int | None = None
 
+    def publish_beat(self, beat_position: float, bpm: float, beat_count: int) -> None:
+        """Publish new beat state (one store; needs no lock)."""
+        self.beat_snapshot = (beat_position, bpm, beat_count)
+
+    def reset_beat(self) -> None:
+        """Move to beat 1 (position 0.0), keeping the current tempo."""
+        self.beat_snapshot = (0.0, self.beat_snapshot[1], 1)
+
+    @property
+    def beat_position(self) -> float:
+        return self.beat_snapshot[0]
 
-def rgb_to_rgb16(r: float, g: float, b: float, gamma: float = 2.2) -> tuple[int, int, int]:
+    @property
+    def bpm(self) -> float:
+        return self.beat_snapshot[1]
+
+    @property
+    def beat_count(self) -> int:
+        return self.beat_snapshot[2]
+
+    @property
+    def zone_brightness(self) -> dict[str, float]:
+        """Per-zone brightness as a zone name -> value dict (a snapshot)."""
+        return dict(zip(ZONE_NAMES, self.zone_brightness_arr.tolist()))
+
+    def set_zone_brightness(self, zone: str, value: float) -> None:
+        """Set one zone's brightness, clamped to 0.0-1.0."""
+        self.zone_brightness_arr[ZONE_NAMES.index(zone)] = max(0.0, min(1.0, value))
+
+
+def rgb_to_rgb16(r: float, g: float, b: float, gamma: float = GAMMA) -> tuple[int, int, int]:
     """Convert RGB floats (0.0-1.0) to RGB16 (0-65535) with gamma correction.
 
     Gamma correction makes fades perceptually linear. Without it, LED fades
@@ -305,6 +406,62 @@ def rgb_to_rgb16(r: float, g: float, b: float, gamma: float = 2.2) -> tuple[int,
     return (int(r * 65535), int(g * 65535), int(b * 65535))
 
 
+def shade_rgb16(colors: np.ndarray, light_mult: np.ndarray, out: np.ndarray) -> None:
+    """Dim, gamma-correct and scale a frame of colors to RGB16 in one pass.
+
+    Table-driven version of rgb_to_rgb16 for the render loop: ``colors`` is
+    an (N, 3) array of 0.0-1.0 floats (overwritten as scratch space),
+    ``light_mult`` a per-light brightness multiplier, and ``out`` an (N, 3)
+    uint16 destination. Gamma comes from GAMMA16_LUT instead of ``**``.
+    """
+    colors *= (light_mult * GAMMA_LUT_STEPS)[:, None]
+    np.clip(colors, 0.0, GAMMA_LUT_STEPS, out=colors)
+    colors += 0.5  # Round to the nearest table entry
+    out[:] = GAMMA16_LUT[colors.astype(np.intp)]
+
+
+def scale_rgb16(colors: np.ndarray, light_mult: np.ndarray, out: np.ndarray) -> None:
+    """Dim and scale a frame of colors to linear RGB16, leaving gamma to the bridge.
+
+    Same arguments as shade_rgb16. Undimmed 8-bit levels map to ``x << 8 | x``
+    (i.e. ``x * 257``), the exact 0-255 -> 0-65535 rescale.
+    """
+    colors *= (light_mult * 65535.0)[:, None]
+    np.clip(colors, 0.0, 65535.0, out=colors)
+    colors += 0.5  # Round to the nearest level
+    out[:] = colors
+
+
+def raise_render_priority(render_cpu: int | None = None) -> None:
+    """Give the calling (render) thread real-time scheduling where possible.
+
+    Uses SCHED_FIFO on Linux, which needs CAP_SYS_NICE or an RLIMIT_RTPRIO
+    allowance (e.g. ``ulimit -r 20``). Falls back to a negative nice value,
+    and otherwise leaves the default priority alone. If ``render_cpu`` is
+    given, the thread is also pinned to that CPU.
+    """
+    if render_cpu is not None and hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, {render_cpu})
+            print(f"[RENDER] Pinned to CPU {render_cpu}")
+        except (OSError, ValueError) as e:
+            print(f"[RENDER] Could not pin to CPU {render_cpu}: {e}")
+
+    if hasattr(os, "sched_setscheduler"):
+        try:
+            # pid 0 = calling thread on Linux
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(RENDER_RT_PRIORITY))
+            print(f"[RENDER] Real-time priority enabled (SCHED_FIFO {RENDER_RT_PRIORITY})")
+            return
+        except (OSError, AttributeError):
+            pass
+    try:
+        os.nice(-10)
+        print("[RENDER] Raised priority (nice -10)")
+    except OSError:
+        print("[RENDER] Running at normal priority (no permission to raise it)")
+
+
 def render_loop(
     engine_state: EngineState,
     streaming,  # Direct Streaming object from hue-entertainment-pykit
@@ -312,6 +469,9 @@ def render_loop(
     num_lights: int,
     channel_mapping: dict[int, int] | None = None,
     light_zones: dict[int, str] | None = None,
+    realtime_priority: bool = True,
+    render_cpu: int | None = None,
+    gamma_in_python: bool = False,
 ):
     """Dedicated thread for smooth Hue updates at fixed rate.
 
@@ -322,6 +482,10 @@ def render_loop(
                         If None, assumes identity mapping.
         light_zones: Maps light index -> zone name (e.g., "ceiling", "perimeter").
                     Used for per-zone brightness control.
+        realtime_priority: Try to run this thread with SCHED_FIFO priority.
+        render_cpu: CPU to pin this thread to (only with realtime_priority).
+        gamma_in_python: Gamma-correct colors before sending (shade_rgb16)
+                         instead of sending linear RGB16 (scale_rgb16).
     """
     if channel_mapping is None:
         channel_mapping = {i: i for i in range(num_lights)}
@@ -341,33 +505,61 @@ def render_loop(
     streaming_service._is_connection_alive = True
     print("[RENDER] Library threads stopped, we have exclusive socket access")
 
-    # Pre-build the message header
-    protocol_name = "HueStream".encode("utf-8")
-    version = struct.pack(">BB", 0x02, 0x00)
-    sequence_id = struct.pack(">B", 0x07)
-    reserved = b"\x00\x00"
-    color_space = struct.pack(">B", 0x00)  # RGB
-    reserved2 = b"\x00"
-    entertainment_id = streaming_service._entertainment_config.id.encode("utf-8")
+    if realtime_priority:
+        raise_render_priority(render_cpu)
+
+    to_rgb16 = shade_rgb16 if gamma_in_python else scale_rgb16
 
-    header = protocol_name + version + sequence_id + reserved + color_space + reserved2 + entertainment_id
+    # Message header (same for all messages): fixed prefix + area id
+    entertainment_id = streaming_service._entertainment_config.id.encode("utf-8")
+    header = HUESTREAM_HEADER_PREFIX + entertainment_id
+
+    # Per-frame color pipeline works on whole arrays rather than per-light tuples.
+    # colors_arr holds 0.0-1.0 RGB floats. The message is a fixed template:
+    # header and API channel ids are written once, and frame is a view over
+    # the channel records, so each frame only overwrites the RGB16 slots.
+    colors_arr = np.zeros((num_lights, 3))
+    msg_template = bytearray(len(header) + num_lights * LIGHT_FRAME_DTYPE.itemsize)
+    msg_template[: len(header)] = header
+    frame = np.frombuffer(msg_template, dtype=LIGHT_FRAME_DTYPE, offset=len(header))
+    frame["channel"] = [channel_mapping.get(i, i) for i in range(num_lights)]
+
+    # Zone index per light into ZONE_NAMES; -1 (no zone) selects the trailing
+    # 1.0 slot of engine_state.zone_brightness_arr
+    zone_idx = np.array(
+        [
+            ZONE_NAMES.index(light_zones[i]) if light_zones.get(i) in ZONE_NAMES else -1
+            for i in range(num_lights)
+        ],
+        dtype=np.intp,
+    )
 
     # Timing diagnostics
     frame_count = 0
-    last_report = time.time()
-    last_frame_end = time.time()
+    last_report = time.monotonic()
+    last_frame_end = last_report
 
     # Diagnostic tracking
     send_errors = 0
+    dropped_frames = 0
+    consecutive_drops = 0
+    skipped_frames = 0
+    last_sent = None  # Last message that went out, for change detection
+    last_sent_time = 0.0
+    last_sent_repeats = 0  # Times last_sent has gone out in a row
     long_frames = 0
     last_light_state = None  # Track (r,g,b) of light 0 for state change detection
     state_stuck_start = None  # When current state started
     last_beat_pos = 0.0
     beat_stuck_count = 0
-    LOG_DIAGNOSTICS = os.environ.get("DJ_HUE_DEBUG", "").lower() in ("1", "true", "yes")
+
+    # Frame deadlines on the monotonic clock (immune to wall-clock/NTP jumps).
+    # fade_start_time and identify_until are still wall-clock times set by
+    # other threads, so those comparisons keep using time.time().
+    next_deadline = time.monotonic()
 
     while engine_state.running:
-        frame_start = time.time()
+        frame_start = time.monotonic()
 
         # Detect if previous frame took too long (gap > 50ms suggests something stalled)
         frame_gap = frame_start - last_frame_end
@@ -376,56 +568,40 @@ def render_loop(
             if LOG_DIAGNOSTICS:
                 print(f"[RENDER] WARNING: {frame_gap*1000:.0f}ms gap between frames!")
 
-        # Get beat state
-        with engine_state.lock:
-            beat_pos = engine_state.beat_position
-            bpm = engine_state.bpm
+        # Get beat state (lock-free read, see EngineState)
+        beat_pos, bpm, _ = engine_state.beat_snapshot
 
         # Check if beat position is stuck (not advancing)
-        if beat_pos == last_beat_pos:
-            beat_stuck_count += 1
-            if beat_stuck_count == 50 and LOG_DIAGNOSTICS:  # ~1 second at 50Hz
-                print(f"[RENDER] WARNING: beat_position stuck at {beat_pos:.3f} for 50+ frames!")
-        else:
-            if beat_stuck_count >= 50 and LOG_DIAGNOSTICS:
-                print(f"[RENDER] beat_position unstuck, was stuck for {beat_stuck_count} frames")
-            beat_stuck_count = 0
-            last_beat_pos = beat_pos
+        if LOG_DIAGNOSTICS:
+            if beat_pos == last_beat_pos:
+                beat_stuck_count += 1
+                if beat_stuck_count == 50:  # ~1 second at 50Hz
+                    print(f"[RENDER] WARNING: beat_position stuck at {beat_pos:.3f} for 50+ frames!")
+            else:
+                if beat_stuck_count >= 50:
+                    print(f"[RENDER] beat_position unstuck, was stuck for {beat_stuck_count} frames")
+                beat_stuck_count = 0
+                last_beat_pos = beat_pos
 
         # Update pattern engine with MIDI clock position
         pattern_engine.beat_clock.beat_position = beat_pos
         pattern_engine.beat_clock.bpm = bpm
 
-        # Compute colors from pattern engine
-        colors = pattern_engine.compute_colors()
-
-        # Convert to light colors list
-        light_colors = []
-        for channel_id in range(num_lights):
-            rgb = colors.get(channel_id)
-            if rgb:
-                light_colors.append((rgb.r / 255.0, rgb.g / 255.0, rgb.b / 255.0))
-            else:
-                light_colors.append((0.0, 0.0, 0.0))
+        # Compute 0.0-1.0 colors from pattern engine straight into colors_arr
+        pattern_engine.compute_colors_into(colors_arr)
 
         # Get zone brightness, fade state, and identify mode
-        with engine_state.lock:
-            zone_brightness = dict(engine_state.zone_brightness)
-            identify_idx = engine_state.identify_light_index
-            identify_until = engine_state.identify_until
-            fade_active = engine_state.fade_active
-            fade_start = engine_state.fade_start_time
-            fade_duration = engine_state.fade_duration
-
-        # Apply per-zone brightness multipliers
-        for i, (r, g, b) in enumerate(light_colors):
-            zone = light_zones.get(i)
-            if zone and zone in zone_brightness:
-                brightness = zone_brightness[zone]
-                if brightness < 1.0:
-                    light_colors[i] = (r * brightness, g * brightness, b * brightness)
-
-        # Apply fade out multiplier
+        # (lock-free reads; flags are read before the times they guard)
+        identify_idx = engine_state.identify_light_index
+        identify_until = engine_state.identify_until
+        fade_active = engine_state.fade_active
+        fade_start = engine_state.fade_start_time
+        fade_duration = engine_state.fade_duration
+
+        # Per-light brightness: zone multiplier times fade out multiplier,
+        # applied to the colors in shade_rgb16 (indexing makes a fresh array)
+        light_mult = engine_state.zone_brightness_arr[zone_idx]
+
         if fade_active:
             elapsed = time.time() - fade_start
             if elapsed >= fade_duration:
@@ -433,7 +609,7 @@ def render_loop(
             else:
                 fade_mult = 1.0 - (elapsed / fade_duration)
             if fade_mult < 1.0:
-                light_colors = [(r * fade_mult, g * fade_mult, b * fade_mult) for r, g, b in light_colors]
+                light_mult *= fade_mult
 
         if identify_idx is not None and 0 <= identify_idx < num_lights:
             now = time.time()
@@ -441,82 +617,129 @@ def render_loop(
                 # Flash pattern: alternate white/off every 150ms
                 phase = int((identify_until - now) / 0.15) % 2
                 if phase == 0:
-                    light_colors[identify_idx] = (1.0, 1.0, 1.0)  # White
+                    colors_arr[identify_idx] = 1.0  # White
                 else:
-                    light_colors[identify_idx] = (0.0, 0.0, 0.0)  # Off
+                    colors_arr[identify_idx] = 0.0  # Off
+                light_mult[identify_idx] = 1.0  # Ignore zone dimming and fade
             else:
-                # Done identifying, clear the flag
+                # Done identifying, clear the flag (unless a new identify
+                # request arrived since this frame read it)
                 with engine_state.lock:
-                    engine_state.identify_light_index = None
+                    if engine_state.identify_until == identify_until:
+                        engine_state.identify_light_index = None
 
         # Track state changes for diagnostics
-        current_light_state = light_colors[0] if light_colors else (0, 0, 0)
-        if current_light_state != last_light_state:
-            if LOG_DIAGNOSTICS and state_stuck_start is not None:
-                stuck_duration = frame_start - state_stuck_start
-                is_on = current_light_state[0] > 0.01 or current_light_state[1] > 0.01 or current_light_state[2] > 0.01
-                was_on = last_light_state and (last_light_state[0] > 0.01 or last_light_state[1] > 0.01 or last_light_state[2] > 0.01)
-                transition = f"{'ON' if was_on else 'OFF'}->{'ON' if is_on else 'OFF'}"
-                # Log ALL state changes to see if we're missing some
-                print(f"[RENDER] {stuck_duration*1000:6.1f}ms @ beat {beat_pos:.4f} ({transition})")
-            state_stuck_start = frame_start
-            last_light_state = current_light_state
-
-        # Send ALL lights in a single batched message for synchronized updates
-        all_channels_data = b""
-        for our_idx, (r, g, b) in enumerate(light_colors):
-            api_channel = channel_mapping.get(our_idx, our_idx)
-            r16, g16, b16 = rgb_to_rgb16(r, g, b)
-            all_channels_data += struct.pack(">B", api_channel) + struct.pack(">HHH", r16, g16, b16)
-        message = header + all_channels_data
+        if LOG_DIAGNOSTICS:
+            current_light_state = tuple((colors_arr[0] * light_mult[0]).tolist()) if num_lights else (0, 0, 0)
+            if current_light_state != last_light_state:
+                if state_stuck_start is not None:
+                    stuck_duration = frame_start - state_stuck_start
+                    is_on = current_light_state[0] > 0.01 or current_light_state[1] > 0.01 or current_light_state[2] > 0.01
+                    was_on = last_light_state and (last_light_state[0] > 0.01 or last_light_state[1] > 0.01 or last_light_state[2] > 0.01)
+                    transition = f"{'ON' if was_on else 'OFF'}->{'ON' if is_on else 'OFF'}"
+                    # Log ALL state changes to see if we're missing some
+                    print(f"[RENDER] {stuck_duration*1000:6.1f}ms @ beat {beat_pos:.4f} ({transition})")
+                state_stuck_start = frame_start
+                last_light_state = current_light_state
+
+        # Dim (and optionally gamma-correct) and scale to RGB16 for all lights at once
+        to_rgb16(colors_arr, light_mult, frame["rgb"])
+
+        # Send ALL lights in a single batched message for synchronized updates.
+        # The template buffer is sent as-is (sockets take any bytes-like
+        # object); only a frame that actually went out is copied, as the
+        # change-detection reference and the library's keep-alive message.
         try:
-            send_start = time.time()
-            dtls_socket.send(message)
-            send_elapsed = time.time() - send_start
-            if send_elapsed > 0.05 and LOG_DIAGNOSTICS:  # > 50ms send time
-                print(f"[RENDER] SLOW SEND: {send_elapsed*1000:.0f}ms")
+            send_start = time.monotonic()
+            unchanged = msg_template == last_sent
+            if (
+                unchanged
+                and last_sent_repeats >= RESEND_BURST
+                and send_start - last_sent_time < RESEND_INTERVAL
+            ):
+                # Held pattern: unchanged and already sent a burst of times
+                skipped_frames += 1
+            elif not select.select((), (dtls_socket,), (), 0)[1]:
+                # Drop, don't queue: a frame that can't be sent immediately
+                # is stale by the next tick. The socket stays blocking, since
+                # the library's keep-alive thread shares it and treats any
+                # send error (EAGAIN included) as a lost connection.
+                dropped_frames += 1
+                consecutive_drops += 1
+                if LOG_DIAGNOSTICS and consecutive_drops == 3:
+                    print("[RENDER] 3 frames dropped in a row (socket not writable)")
+            else:
+                dtls_socket.send(msg_template)
+                send_elapsed = time.monotonic() - send_start
+                if LOG_DIAGNOSTICS and send_elapsed > 0.05:  # > 50ms send time
+                    print(f"[RENDER] SLOW SEND: {send_elapsed*1000:.0f}ms")
+                consecutive_drops = 0
+                last_sent_time = send_start
+                if unchanged:
+                    last_sent_repeats += 1
+                else:
+                    last_sent = bytes(msg_template)
+                    last_sent_repeats = 1
+                    streaming_service._last_message = last_sent
         except Exception as e:
             send_errors += 1
             if LOG_DIAGNOSTICS:
                 print(f"[RENDER] DTLS send error #{send_errors}: {e}")
-        streaming_service._last_message = message
+            # The keep-alive thread may have reconnected on a new socket
+            dtls_socket = streaming_service._dtls_service.get_socket()
 
         frame_count += 1
 
         # Periodic stats report
-        now = time.time()
+        now = time.monotonic()
         if now - last_report >= 5.0:
-            if LOG_DIAGNOSTICS or send_errors > 0 or long_frames > 0:
-                print(f"[RENDER] 5s stats: {frame_count} frames, {send_errors} errs, {long_frames} long, beat={beat_pos:.2f}")
+            if LOG_DIAGNOSTICS or send_errors > 0 or long_frames > 0 or dropped_frames > 0:
+                print(
+                    f"[RENDER] 5s stats: {frame_count} frames, {send_errors} errs, "
+                    f"{dropped_frames} dropped, {skipped_frames} unchanged, "
+                    f"{long_frames} long, beat={beat_pos:.2f}"
+                )
             frame_count = 0
+            skipped_frames = 0
             send_errors = 0
+            dropped_frames = 0
             long_frames = 0
             last_report = now
 
-        # Precise timing
-        elapsed = time.time() - frame_start
-        sleep_time = RENDER_INTERVAL - elapsed
+        # Precise timing: sleep until this frame's absolute deadline so
+        # oversleeping one frame doesn't push back every later frame
+        next_deadline += RENDER_INTERVAL
+        now = time.monotonic()
+        sleep_time = next_deadline - now
         if sleep_time > 0:
             time.sleep(sleep_time)
-        elif LOG_DIAGNOSTICS and elapsed > RENDER_INTERVAL * 1.5:
-            print(f"[RENDER] Frame overrun: {elapsed*1000:.1f}ms (target {RENDER_INTERVAL*1000:.1f}ms)")
+        else:
+            elapsed = now - frame_start
+            if LOG_DIAGNOSTICS and elapsed > RENDER_INTERVAL * 1.5:
+                print(f"[RENDER] Frame overrun: {elapsed*1000:.1f}ms (target {RENDER_INTERVAL*1000:.1f}ms)")
+            if sleep_time < -2 * RENDER_INTERVAL:
+                # Too far behind to catch up: resync rather than burst frames
+                next_deadline = now
 
-        last_frame_end = time.time()
+        last_frame_end = time.monotonic()
 
     print("[RENDER] Stopped")
 
 
+@functools.cache
 def load_config():
-    """Load Hue config from config.yaml."""
-    config_path = os.path.join(os.path.dirname(__file__), "..", "..", "..", "config.yaml")
+    """Load Hue config from config.yaml.
 
-    if not os.path.exists(config_path):
+    The file is parsed once per process; later calls return the cached dict
+    (``load_config.cache_clear()`` forces a re-read).
+    """
+    if not CONFIG_PATH.exists():
         raise FileNotFoundError(
-            f"Config not found: {config_path}\n" "Run 'dj-hue --setup' first."
+            f"Config not found: {CONFIG_PATH}\n" "Run 'dj-hue --setup' first."
         )
 
-    with open(config_path, "r") as f:
-        config = yaml.safe_load(f)
+    with CONFIG_PATH.open("rb") as f:
+        config = yaml.load(f, Loader=_YamlLoader)
 
     return config.get("hue", {})
 
@@ -529,30 +752,42 @@ def get_light_names(bridge_ip: str, username: str) -> tuple[dict[str, str], dict
         - names: Maps light/entertainment IDs to human-readable names
         - device_ids: Maps entertainment IDs to their owner device IDs (for grouping)
     """
+    from concurrent.futures import ThreadPoolExecutor
+
     import requests
     import urllib3
     urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-    headers = {"hue-application-key": username}
     names: dict[str, str] = {}
     device_ids: dict[str, str] = {}
 
+    # One keep-alive session whose pool holds a connection per parallel request
+    session = requests.Session()
+    session.headers.update({"hue-application-key": username})
+    session.verify = False
+    session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=3))
+
+    def fetch(resource: str) -> list[dict]:
+        resp = session.get(f"https://{bridge_ip}/clip/v2/resource/{resource}", timeout=(2, 5))
+        return resp.json().get("data", [])
+
     try:
+        # The three requests are independent; only the parsing below is ordered
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            device_future = executor.submit(fetch, "device")
+            light_future = executor.submit(fetch, "light")
+            ent_future = executor.submit(fetch, "entertainment")
+            devices = device_future.result()
+            lights = light_future.result()
+            entertainment = ent_future.result()
+
         # First, get device names (devices own both lights and entertainment resources)
         device_names: dict[str, str] = {}
-        resp = requests.get(
-            f"https://{bridge_ip}/clip/v2/resource/device",
-            headers=headers, verify=False, timeout=5
-        )
-        for item in resp.json().get("data", []):
+        for item in devices:
             device_names[item["id"]] = item.get("metadata", {}).get("name", "Unknown")
 
         # Map light IDs to names
-        resp = requests.get(
-            f"https://{bridge_ip}/clip/v2/resource/light",
-            headers=headers, verify=False, timeout=5
-        )
-        for item in resp.json().get("data", []):
+        for item in lights:
             # Light has its own name in metadata
             name = item.get("metadata", {}).get("name")
             if not name:
@@ -562,11 +797,7 @@ def get_light_names(bridge_ip: str, username: str) -> tuple[dict[str, str], dict
             names[item["id"]] = name
 
         # Map entertainment IDs to names and device IDs
-        resp = requests.get(
-            f"https://{bridge_ip}/clip/v2/resource/entertainment",
-            headers=headers, verify=False, timeout=5
-        )
-        for item in resp.json().get("data", []):
+        for item in entertainment:
             owner = item.get("owner", {})
             owner_rid = owner.get("rid", "")
             name = device_names.get(owner_rid, "Unknown")
@@ -575,43 +806,113 @@ def get_light_names(bridge_ip: str, username: str) -> tuple[dict[str, str], dict
 
     except Exception as e:
         print(f"[HUE] Warning: Could not fetch light names: {e}")
+    finally:
+        session.close()
 
     return names, device_ids
 
 
+class MidiInput:
+    """Virtual MIDI input port delivered through mido's callback.
+
+    The callback runs on the MIDI backend's thread and only queues the
+    message and pokes a wake-up pipe, so the main loop can ``select`` on MIDI
+    and the keyboard together instead of polling ``port.poll()``. The same
+    pipe is poked on shutdown (see ``wake``), so that ``select`` needs no
+    timeout.
+    """
+
+    def __init__(self, port_name: str):
+        self.port_name = port_name
+        self.messages: collections.deque[mido.Message] = collections.deque()
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        self._port = None
+
+    def __enter__(self) -> "MidiInput":
+        self._port = mido.open_input(self.port_name, virtual=True, callback=self._on_message)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._port is not None:
+            self._port.close()
+            self._port = None
+        os.close(self._wake_r)
+        os.close(self._wake_w)
+
+    def _on_message(self, msg: mido.Message) -> None:
+        """mido callback: queue the message and wake the main loop."""
+        self.messages.append(msg)
+        self.wake()
+
+    def wake(self) -> None:
+        """Make the wake-up pipe readable (safe from signal handlers)."""
+        try:
+            os.write(self._wake_w, b"\0")
+        except BlockingIOError:
+            pass  # Pipe full: a wake-up is already pending
+        except OSError:
+            pass  # Already closed: nothing left waiting on it
+
+    def fileno(self) -> int:
+        """File descriptor that becomes readable when MIDI arrives."""
+        return self._wake_r
+
+    def clear_wakeups(self) -> None:
+        """Drain pending wake-up bytes (call before consuming messages)."""
+        try:
+            while os.read(self._wake_r, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+
+# One key in raw terminal input: a CSI/SS3 escape sequence (arrows etc.),
+# Alt+key, or a single character (including a lone Escape)
+_KEY_RE = re.compile(r"\x1b\[[0-?]*[ -/]*[@-~]|\x1bO.|\x1b.|.", re.DOTALL)
+
+
 class KeyboardListener:
-    """Non-blocking keyboard input listener."""
+    """Single-key terminal input, selected on from the main MIDI loop.
+
+    Input is read in chunks (one ``read`` for a burst of keys or a paste)
+    and split into keys, which are queued until taken with ``get_key``.
+    """
 
     def __init__(self):
-        self.last_key = None
-        self._running = False
-        self._thread = None
         self._old_settings = None
+        self._keys: collections.deque[str] = collections.deque()
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
 
     def start(self):
-        """Start listening for keyboard input."""
-        self._running = True
+        """Put the terminal in cbreak mode for single-key input."""
         self._old_settings = termios.tcgetattr(sys.stdin)
         tty.setcbreak(sys.stdin.fileno())
-        self._thread = threading.Thread(target=self._listen, daemon=True)
-        self._thread.start()
-
-    def _listen(self):
-        """Listen for keypresses in background thread."""
-        while self._running:
-            if select.select([sys.stdin], [], [], 0.1)[0]:
-                key = sys.stdin.read(1)
-                self.last_key = key
-
-    def get_key(self):
-        """Get last pressed key (or None)."""
-        key = self.last_key
-        self.last_key = None
-        return key
+
+    def fileno(self) -> int:
+        """File descriptor to wait on for keypresses."""
+        return sys.stdin.fileno()
+
+    def fill(self) -> None:
+        """Read all available input and queue its keys (call once stdin is readable)."""
+        text = self._decoder.decode(os.read(self.fileno(), 64))
+        self._keys.extend(_KEY_RE.findall(text))
+
+    def get_key(self) -> str | None:
+        """Take the next queued key (None if there is none)."""
+        return self._keys.popleft() if self._keys else None
+
+    def wait_key(self, timeout: float | None = None) -> str | None:
+        """Block until a key is pressed and return it (None after ``timeout``)."""
+        if not self._keys:
+            if not select.select([self], [], [], timeout)[0]:
+                return None
+            self.fill()
+        return self.get_key()
 
     def stop(self):
-        """Stop listening and restore terminal."""
-        self._running = False
+        """Restore terminal."""
         if self._old_settings:
             termios.tcsetattr(sys.stdin, termios.TCSADRAIN, self._old_settings)
 
@@ -626,30 +927,107 @@ BOLD = "\033[1m"
 RESET = "\033[0m"
 DIM = "\033[2m"
 
+# Rows last drawn by render_screen; None forces a full clear-and-redraw.
+# Other threads may print over the screen, so a full redraw is also done
+# at least this often.
+_screen_lines: list[str] | None = None
+_last_full_redraw = 0.0
+FULL_REDRAW_INTERVAL = 5.0
+
+# Fixed lines of the interfaces, built once
+RULE = "─" * 50
+PATTERN_SELECTOR_HEADER = (
+    f"{BOLD}PATTERN SELECTOR{RESET}",
+    RULE,
+    f"{DIM}Type number + Enter, or Escape to cancel{RESET}",
+    "",
+)
+PALETTE_SELECTOR_HEADER = (
+    f"{BOLD}PALETTE SELECTOR{RESET}",
+    RULE,
+    f"{DIM}Type number + Enter, or Escape to cancel{RESET}",
+    "",
+)
+SELECTOR_FOOTER = ("", RULE)
+PATTERN_MODE_HELP = f"{DIM}[Tab] palettes  [/] prev/next  [b] blackout  [f] flash  [p] all  [q] quit{RESET}"
+PALETTE_MODE_HELP = f"{DIM}[Tab] patterns  [/] prev/next  [b] blackout  [f] flash  [c] all  [q] quit{RESET}"
+
+# Pattern selector: a typed number that could still grow (e.g. "1" with 10+
+# patterns) is committed after this long without another key
+QUICK_SELECT_TIMEOUT = 0.4
+
 
 def rgb_swatch(r: int, g: int, b: int) -> str:
     """Return 2-char colored block using 24-bit ANSI."""
     return f"\033[48;2;{r};{g};{b}m  \033[0m"
 
 
-def hsv_to_rgb_int(hsv) -> tuple[int, int, int]:
-    """Convert HSV to RGB integers (0-255)."""
+@functools.lru_cache(maxsize=256)
+def _hsv_to_rgb_int(hue: float, saturation: float, value: float) -> tuple[int, int, int]:
     import colorsys
-    r, g, b = colorsys.hsv_to_rgb(hsv.hue, hsv.saturation, hsv.value)
+    r, g, b = colorsys.hsv_to_rgb(hue, saturation, value)
     return int(r * 255), int(g * 255), int(b * 255)
 
 
+def hsv_to_rgb_int(hsv) -> tuple[int, int, int]:
+    """Convert HSV to RGB integers (0-255)."""
+    return _hsv_to_rgb_int(hsv.hue, hsv.saturation, hsv.value)
+
+
+@functools.lru_cache(maxsize=64)
+def _swatches_for_colors(colors: tuple) -> str:
+    return "".join(rgb_swatch(*hsv_to_rgb_int(hsv)) for hsv in colors)
+
+
 def palette_swatches(palette_name: str) -> str:
-    """Generate color swatches for a palette."""
-    from dj_hue.patterns.strudel.palettes import get_palette
+    """Generate color swatches for a palette.
+
+    Cached on the palette's (immutable) color tuple, so redraws reuse the
+    rendered string and a re-registered palette still gets fresh swatches.
+    """
     palette = get_palette(palette_name)
     if not palette:
         return ""
-    swatches = ""
-    for hsv in palette.colors:
-        r, g, b = hsv_to_rgb_int(hsv)
-        swatches += rgb_swatch(r, g, b)
-    return swatches
+    return _swatches_for_colors(palette.colors)
+
+
+def invalidate_screen() -> None:
+    """Make the next render_screen call clear and redraw the whole screen."""
+    global _screen_lines
+    _screen_lines = None
+
+
+def render_screen(lines: list[str], tail: str = "") -> None:
+    """Draw ``lines`` from the top of the terminal.
+
+    Only rows that differ from the previous call are rewritten (cursor to the
+    row, clear it, write it), so a beat tick that changes the status line
+    sends one line instead of the whole screen. ``tail`` (e.g. a prompt) is
+    written below the lines in the same write; it is not tracked.
+    """
+    global _screen_lines, _last_full_redraw
+    previous = _screen_lines
+    now = time.monotonic()
+    if previous is None or now - _last_full_redraw >= FULL_REDRAW_INTERVAL:
+        output = CURSOR_HOME + CLEAR_SCREEN + "\n".join(lines) + "\n"
+        _last_full_redraw = now
+    else:
+        parts = [
+            f"\033[{row + 1};1H{CLEAR_LINE}{line}"
+            for row, line in enumerate(lines)
+            if row >= len(previous) or previous[row] != line
+        ]
+        if len(lines) < len(previous):
+            # Clear leftover rows below the new last line
+            parts.append(f"\033[{len(lines) + 1};1H\033[J")
+        if not parts and not tail:
+            return
+        # Leave the cursor below the interface, where a full draw leaves it
+        parts.append(f"\033[{len(lines) + 1};1H")
+        output = "".join(parts)
+    _screen_lines = lines
+    sys.stdout.write(output + tail)
+    sys.stdout.flush()
 
 
 def get_pattern_display_name(pattern_engine: PatternEngine, name: str) -> str:
@@ -668,7 +1046,7 @@ def draw_interface(pattern_engine: PatternEngine, bpm: float, bar: int, beat: in
     # Build the interface
     lines = []
     lines.append(f"{BOLD}DJ-HUE{RESET} │ {bpm:.0f} BPM │ Bar {bar} Beat {beat}")
-    lines.append("─" * 50)
+    lines.append(RULE)
 
     # Current pattern (highlighted)
     lines.append(f"{BOLD}Pattern:{RESET} {current_name}")
@@ -698,17 +1076,14 @@ def draw_interface(pattern_engine: PatternEngine, bpm: float, bar: int, beat: in
         lines.append(f"  {DIM}... +{total - 9} more (press p){RESET}")
 
     lines.append("")
-    lines.append(f"{DIM}[Tab] palettes  [/] prev/next  [b] blackout  [f] flash  [p] all  [q] quit{RESET}")
+    lines.append(PATTERN_MODE_HELP)
 
     # Message line
     if message:
         lines.append("")
         lines.append(f"  {message}")
 
-    # Clear and draw
-    output = CURSOR_HOME + CLEAR_SCREEN
-    output += "\n".join(lines)
-    print(output, flush=True)
+    render_screen(lines)
 
 
 def draw_palette_interface(pattern_engine: PatternEngine, bpm: float, bar: int, beat: int, message: str = ""):
@@ -716,13 +1091,12 @@ def draw_palette_interface(pattern_engine: PatternEngine, bpm: float, bar: int,
     current_pattern = pattern_engine.get_current_pattern_name()
     current_desc = pattern_engine.get_current_pattern_description()
     current_palette = pattern_engine.get_active_palette_name() or "Default"
-    palette_info = pattern_engine.get_available_palettes()
-    palettes = [p["name"] if isinstance(p, dict) else p for p in palette_info]
+    palettes = pattern_engine.get_palette_names()
     override = pattern_engine.get_palette_override()
 
     lines = []
     lines.append(f"{BOLD}DJ-HUE{RESET} │ {bpm:.0f} BPM │ Bar {bar} Beat {beat}")
-    lines.append("─" * 50)
+    lines.append(RULE)
 
     # Current pattern and palette with ANSI preview
     palette_indicator = " (override)" if override else ""
@@ -759,41 +1133,32 @@ def draw_palette_interface(pattern_engine: PatternEngine, bpm: float, bar: int,
         lines.append(f"  {DIM}... +{len(palettes) - 9} more (press c){RESET}")
 
     lines.append("")
-    lines.append(f"{DIM}[Tab] patterns  [/] prev/next  [b] blackout  [f] flash  [c] all  [q] quit{RESET}")
+    lines.append(PALETTE_MODE_HELP)
 
     if message:
         lines.append("")
         lines.append(f"  {message}")
 
-    output = CURSOR_HOME + CLEAR_SCREEN
-    output += "\n".join(lines)
-    print(output, flush=True)
+    render_screen(lines)
 
 
-def print_pattern_selector(pattern_engine: PatternEngine) -> None:
-    """Print pattern selection menu with all available patterns."""
+def print_pattern_selector(pattern_engine: PatternEngine, prompt: str = "") -> None:
+    """Print pattern selection menu with all available patterns, then ``prompt``."""
     patterns = pattern_engine.pattern_names
     current_idx = pattern_engine._current_pattern_index
 
-    output = CURSOR_HOME + CLEAR_SCREEN
-    lines = []
-    lines.append(f"{BOLD}PATTERN SELECTOR{RESET}")
-    lines.append("─" * 50)
-    lines.append(f"{DIM}Type number + Enter, or Escape to cancel{RESET}")
-    lines.append("")
+    lines = [
+        *PATTERN_SELECTOR_HEADER,
+        *(
+            f"{BOLD}  ▶ {i + 1:2d}. {get_pattern_display_name(pattern_engine, name)}{RESET}"
+            if i == current_idx
+            else f"    {i + 1:2d}. {get_pattern_display_name(pattern_engine, name)}"
+            for i, name in enumerate(patterns)
+        ),
+        *SELECTOR_FOOTER,
+    ]
 
-    for i, name in enumerate(patterns):
-        display_name = get_pattern_display_name(pattern_engine, name)
-        marker = "▶" if i == current_idx else " "
-        line = f"  {marker} {i + 1:2d}. {display_name}"
-        if i == current_idx:
-            line = f"{BOLD}  {marker} {i + 1:2d}. {display_name}{RESET}"
-        lines.append(line)
-
-    lines.append("")
-    lines.append("─" * 50)
-
-    print(output + "\n".join(lines), flush=True)
+    render_screen(lines, prompt)
 
 
 def pattern_selector_input(pattern_engine: PatternEngine, keyboard: "KeyboardListener") -> bool:
@@ -802,21 +1167,41 @@ def pattern_selector_input(pattern_engine: PatternEngine, keyboard: "KeyboardLis
 
     Returns True if a pattern was selected, False if cancelled.
     """
-    print_pattern_selector(pattern_engine)
-    print("Enter pattern number: ", end="", flush=True)
+    print_pattern_selector(pattern_engine, "Enter pattern number: ")
+    # The prompt and replies below the list aren't tracked; redraw in full after
+    invalidate_screen()
 
+    # Patterns can't change while the selector is open
+    pattern_count = len(pattern_engine.pattern_names)
     input_buffer = ""
     while True:
-        key = keyboard.get_key()
+        # Once digits are typed, a short pause confirms them like Enter
+        key = keyboard.wait_key(QUICK_SELECT_TIMEOUT if input_buffer else None)
         if key is None:
-            time.sleep(0.05)
-            continue
+            key = "\n"
 
         # Escape to cancel
         if key == "\x1b":  # Escape
             print("\n[Cancelled]")
             return False
 
+        # Backspace
+        if key in ("\x7f", "\b"):
+            if input_buffer:
+                input_buffer = input_buffer[:-1]
+                print("\b \b", end="", flush=True)
+            continue
+
+        # Number input
+        if key.isdigit():
+            input_buffer += key
+            print(key, end="", flush=True)
+            # Quick select: confirm at once when no longer pattern number
+            # starts with these digits (e.g. "3" with fewer than 30 patterns)
+            if int(input_buffer) * 10 <= pattern_count:
+                continue
+            key = "\n"
+
         # Enter to confirm
         if key in ("\n", "\r"):
             if input_buffer:
@@ -836,60 +1221,29 @@ def pattern_selector_input(pattern_engine: PatternEngine, keyboard: "KeyboardLis
                 print("\n[Cancelled]")
                 return False
 
-        # Backspace
-        if key in ("\x7f", "\b"):
-            if input_buffer:
-                input_buffer = input_buffer[:-1]
-                print("\b \b", end="", flush=True)
-            continue
-
-        # Number input
-        if key.isdigit():
-            input_buffer += key
-            print(key, end="", flush=True)
-            continue
 
-        # Quick select: if single digit entered and valid, select immediately
-        if len(input_buffer) == 1 and input_buffer.isdigit():
-            idx = int(input_buffer) - 1
-            if 0 <= idx < len(pattern_engine.pattern_names):
-                # Give a moment to type more digits for patterns 10+
-                pass
-
-
-def print_palette_selector(pattern_engine: PatternEngine) -> None:
-    """Print palette selection menu with all palettes."""
-    palette_info = pattern_engine.get_available_palettes()
-    palettes = [p["name"] if isinstance(p, dict) else p for p in palette_info]
+def print_palette_selector(pattern_engine: PatternEngine, prompt: str = "") -> None:
+    """Print palette selection menu with all palettes, then ``prompt``."""
+    palettes = pattern_engine.get_palette_names()
     override = pattern_engine.get_palette_override()
 
-    output = CURSOR_HOME + CLEAR_SCREEN
-    lines = []
-    lines.append(f"{BOLD}PALETTE SELECTOR{RESET}")
-    lines.append("─" * 50)
-    lines.append(f"{DIM}Type number + Enter, or Escape to cancel{RESET}")
-    lines.append("")
-
-    # Option 0: Default
-    is_default = override is None
-    marker = "▶" if is_default else " "
-    line = f"  {marker}  0. Default (pattern's choice)"
-    if is_default:
-        line = f"{BOLD}{line}{RESET}"
-    lines.append(line)
-
-    for i, name in enumerate(palettes):
-        is_current = (name == override)
-        marker = "▶" if is_current else " "
-        swatches = palette_swatches(name)
-        line = f"  {marker} {i+1:2d}. {name:<12} {swatches}"
-        if is_current:
-            line = f"{BOLD}  {marker} {i+1:2d}. {name:<12}{RESET} {swatches}"
-        lines.append(line)
-
-    lines.append("")
-    lines.append("─" * 50)
-    print(output + "\n".join(lines), flush=True)
+    lines = [
+        *PALETTE_SELECTOR_HEADER,
+        # Option 0: Default
+        (
+            f"{BOLD}  ▶  0. Default (pattern's choice){RESET}"
+            if override is None
+            else "     0. Default (pattern's choice)"
+        ),
+        *(
+            f"{BOLD}  ▶ {i+1:2d}. {name:<12}{RESET} {palette_swatches(name)}"
+            if name == override
+            else f"    {i+1:2d}. {name:<12} {palette_swatches(name)}"
+            for i, name in enumerate(palettes)
+        ),
+        *SELECTOR_FOOTER,
+    ]
+    render_screen(lines, prompt)
 
 
 def palette_selector_input(pattern_engine: PatternEngine, keyboard: "KeyboardListener") -> bool:
@@ -898,15 +1252,13 @@ def palette_selector_input(pattern_engine: PatternEngine, keyboard: "KeyboardLis
 
     Returns True if a palette was selected, False if cancelled.
     """
-    print_palette_selector(pattern_engine)
-    print("Enter palette number (0 for default): ", end="", flush=True)
+    print_palette_selector(pattern_engine, "Enter palette number (0 for default): ")
+    # The prompt and replies below the list aren't tracked; redraw in full after
+    invalidate_screen()
 
     input_buffer = ""
     while True:
-        key = keyboard.get_key()
-        if key is None:
-            time.sleep(0.05)
-            continue
+        key = keyboard.wait_key()
 
         # Escape to cancel
         if key == "\x1b":  # Escape
@@ -923,8 +1275,7 @@ def palette_selector_input(pattern_engine: PatternEngine, keyboard: "KeyboardLis
                         print("\n>>> Palette: Default")
                         return True
                     else:
-                        palette_info = pattern_engine.get_available_palettes()
-                        palettes = [p["name"] if isinstance(p, dict) else p for p in palette_info]
+                        palettes = pattern_engine.get_palette_names()
                         palette_idx = idx - 1
                         if 0 <= palette_idx < len(palettes):
                             pattern_engine.set_palette(palettes[palette_idx])
@@ -999,31 +1350,32 @@ def main():
             print(f"[GROUPS] Added custom group '{group_name}' with indices {group_indices}")
 
     # Build zone assignments from config (zones are mutually exclusive for brightness control)
-    # Default: strip→ceiling, remaining lamps→perimeter
-    ceiling_indices = list(hue.light_groups.get("strip", []))
-    perimeter_indices = list(hue.light_groups.get("lamps", []))
-    ambient_indices: list[int] = []
+    # Default: strip→ceiling, remaining lamps→perimeter. Each zone is a dict
+    # used as an insertion-ordered set (ambient order matters for seq()).
+    zone_members: dict[str, dict[int, None]] = {
+        "ceiling": dict.fromkeys(hue.light_groups.get("strip", [])),
+        "perimeter": dict.fromkeys(hue.light_groups.get("lamps", [])),
+        "ambient": {},
+    }
 
     # Process explicit zone assignments from config
     for zone_name, light_names in zone_config_yaml.items():
+        target = zone_members.get(zone_name)
         for name in light_names:
             if name not in name_to_idx:
                 print(f"[ZONES] Warning: light '{name}' not found for zone '{zone_name}'")
                 continue
             idx = name_to_idx[name]
-            # Remove from default zones (mutually exclusive)
-            if idx in ceiling_indices:
-                ceiling_indices.remove(idx)
-            if idx in perimeter_indices:
-                perimeter_indices.remove(idx)
+            # Remove from every other zone (mutually exclusive)
+            for members in zone_members.values():
+                members.pop(idx, None)
             # Add to the specified zone
-            if zone_name == "ambient":
-                ambient_indices.append(idx)
-            elif zone_name == "ceiling":
-                ceiling_indices.append(idx)
-            elif zone_name == "perimeter":
-                perimeter_indices.append(idx)
+            if target is not None:
+                target[idx] = None
 
+    ceiling_indices = list(zone_members["ceiling"])
+    perimeter_indices = list(zone_members["perimeter"])
+    ambient_indices = list(zone_members["ambient"])
     print(f"[ZONES] ceiling={ceiling_indices}, perimeter={perimeter_indices}, ambient={ambient_indices}")
 
     # Create ambient group for pattern targeting (seq() uses this)
@@ -1032,12 +1384,8 @@ def main():
 
     # Build light_zones mapping (light index -> zone name)
     light_zones: dict[int, str] = {}
-    for idx in ceiling_indices:
-        light_zones[idx] = "ceiling"
-    for idx in perimeter_indices:
-        light_zones[idx] = "perimeter"
-    for idx in ambient_indices:
-        light_zones[idx] = "ambient"
+    for zone_name, members in zone_members.items():
+        light_zones.update(dict.fromkeys(members, zone_name))
 
     if ceiling_indices and perimeter_indices:
         from dj_hue.patterns.common.zones import ZoneConfig
@@ -1059,16 +1407,23 @@ def main():
     # Shared state between MIDI and render threads
     engine_state = EngineState()
 
-    # Start render thread
+    # Start render thread, with shorter GIL hand-offs so it wakes on time
+    sys.setswitchinterval(GIL_SWITCH_INTERVAL)
     render_thread = threading.Thread(
         target=render_loop,
         args=(engine_state, hue._streaming, pattern_engine, num_lights, hue.channel_mapping, light_zones),
+        kwargs={
+            "realtime_priority": hue_config.get("realtime_priority", True),
+            "render_cpu": hue_config.get("render_cpu"),
+            "gamma_in_python": hue_config.get("gamma_in_python", False),
+        },
         daemon=True,
     )
     render_thread.start()
 
     # Create virtual MIDI port
     port_name = "DJ-Hue Clock"
+    midi_in = MidiInput(port_name)
 
     keyboard = KeyboardListener()
 
@@ -1079,8 +1434,34 @@ def main():
     ui_bpm = 120.0
     ui_mode = "pattern"  # "pattern" or "palette"
 
+    # The interface is drawn on its own thread so a slow terminal never
+    # stalls MIDI clock handling: redraw() only flags the screen dirty and
+    # the UI thread draws the latest state. ui_draw_lock keeps it off the
+    # screen while a full-list selector owns the terminal.
+    ui_dirty = threading.Event()
+    ui_draw_lock = threading.Lock()
+
+    def redraw():
+        """Request a redraw of the current mode's interface."""
+        ui_dirty.set()
+
+    def ui_loop():
+        while True:
+            ui_dirty.wait()
+            ui_dirty.clear()
+            if not engine_state.running:
+                return
+            with ui_draw_lock:
+                if ui_mode == "pattern":
+                    draw_interface(pattern_engine, ui_bpm, ui_bar, ui_beat, ui_message)
+                else:
+                    draw_palette_interface(pattern_engine, ui_bpm, ui_bar, ui_beat, ui_message)
+
+    ui_thread = threading.Thread(target=ui_loop, daemon=True)
+
     def signal_handler(sig, frame):
         engine_state.running = False
+        midi_in.wake()  # Unblock the main loop's select
         print("\n[SHUTDOWN] Stopping...")
 
     signal.signal(signal.SIGINT, signal_handler)
@@ -1089,6 +1470,7 @@ def main():
     try:
         keyboard.start()
         print(HIDE_CURSOR, end="", flush=True)
+        ui_thread.start()
 
         # Open MIDI output port to send signals to Ableton
         # Try IAC Driver first (more reliable), fall back to virtual port
@@ -1103,13 +1485,12 @@ def main():
             print(f"[MIDI] Output port: {port_name} Out (virtual)")
 
         # Start control server for touch UI
-        config_path = Path(__file__).parent.parent.parent.parent / "config.yaml"
         control_server = ControlServer(
             pattern_engine=pattern_engine,
             engine_state=engine_state,
             midi_out=midi_out,
             hue_streamer=hue,
-            config_path=config_path,
+            config_path=CONFIG_PATH,
         )
         control_thread = control_server.start_in_thread()
 
@@ -1121,289 +1502,291 @@ def main():
 
         pattern_engine._on_pattern_change = on_pattern_change
 
-        with mido.open_input(port_name, virtual=True) as port:
+        with midi_in:
             tick_count = 0
             beat_count = 1  # 1-indexed: beat 1 is the first beat
-            last_beat_time = time.time()
+            last_beat_time_ns = time.monotonic_ns()
             current_bpm = 120.0
-            last_ui_update = 0
             pending_reset = False  # Quantized reset - triggers on next beat
-
-            # Helper to redraw based on current mode
-            def redraw():
+            needs_redraw = True  # Starts dirty for the initial draw
+
+            def mark_dirty(message: str | None = None):
+                """Flag the interface for redraw, optionally setting the message.
+
+                The main loop redraws once per iteration, however many
+                handlers and MIDI messages marked it.
+                """
+                nonlocal needs_redraw, ui_message
+                needs_redraw = True
+                if message is not None:
+                    ui_message = message
+
+            # Notes sent to Ableton for MIDI mapping, built once: C4 (note 60) on
+            # space for play/restart, C#4 (note 61) on period for tap tempo
+            send_midi = midi_out.send
+            sync_note_on = mido.Message("note_on", note=60, velocity=127, channel=0)
+            sync_note_off = mido.Message("note_off", note=60, velocity=0, channel=0)
+            tap_note_on = mido.Message("note_on", note=61, velocity=127, channel=0)
+            tap_note_off = mido.Message("note_off", note=61, velocity=0, channel=0)
+
+            # Keyboard handlers, dispatched by key through key_handlers below
+            def on_quit():
+                engine_state.running = False
+
+            # Tab: toggle mode
+            def on_tab():
+                nonlocal ui_mode
+                ui_mode = "palette" if ui_mode == "pattern" else "pattern"
+                mark_dirty("")
+
+            # 0-9: select pattern or palette (mode-dependent)
+            def on_digit(digit: int):
                 if ui_mode == "pattern":
-                    draw_interface(pattern_engine, ui_bpm, ui_bar, ui_beat, ui_message)
+                    # Pattern selection (1-9; 0 does nothing here)
+                    if digit and pattern_engine.set_pattern_by_index(digit - 1):
+                        mark_dirty("")
+                elif digit == 0:
+                    pattern_engine.set_palette(None)  # Clear override
+                    mark_dirty("")
                 else:
-                    draw_palette_interface(pattern_engine, ui_bpm, ui_bar, ui_beat, ui_message)
+                    # Palette selection
+                    palettes = pattern_engine.get_palette_names()
+                    if digit <= len(palettes):
+                        pattern_engine.set_palette(palettes[digit - 1])
+                        mark_dirty("")
+
+            # [: previous pattern or palette (mode-dependent)
+            def on_prev():
+                if ui_mode == "pattern":
+                    pattern_engine.prev_pattern()
+                else:
+                    pattern_engine.cycle_palette(-1)
+                mark_dirty("")
 
-            # Initial draw
-            redraw()
+            # ]: next pattern or palette (mode-dependent)
+            def on_next():
+                if ui_mode == "pattern":
+                    pattern_engine.next_pattern()
+                else:
+                    pattern_engine.cycle_palette(1)
+                mark_dirty("")
+
+            # Spacebar: Send MIDI note (for Ableton MIDI mapping) and reset beat counter
+            def on_space():
+                nonlocal tick_count, beat_count, ui_bar, ui_beat, last_beat_time_ns
+                # Send note C4 (note 60) on channel 0 - MIDI map this to Ableton's play/restart
+                send_midi(sync_note_on)
+                send_midi(sync_note_off)
+                # Reset our beat tracking to beat 1
+                tick_count = 0
+                beat_count = 1
+                ui_bar = 1
+                ui_beat = 1
+                last_beat_time_ns = time.monotonic_ns()
+                engine_state.publish_beat(0.0, current_bpm, 1)
+                mark_dirty("SYNC → Bar 1")
+
+            # Period: Send MIDI note for tap tempo (for Ableton MIDI mapping)
+            def on_tap():
+                # Send note C#4 (note 61) on channel 0 - MIDI map this to tap tempo
+                send_midi(tap_note_on)
+                send_midi(tap_note_off)
+                mark_dirty("TAP")
+
+            # Blackout toggle
+            def on_blackout():
+                is_blackout = pattern_engine.toggle_blackout()
+                mark_dirty("BLACKOUT" if is_blackout else "")
+
+            # Flash
+            def on_flash():
+                pattern_engine.trigger_quick_action(QuickAction.flash(duration_beats=0.5))
+                mark_dirty("FLASH!")
+
+            # Reset beat position (quantized to next beat)
+            def on_reset():
+                nonlocal pending_reset
+                pending_reset = True
+                mark_dirty("Reset on next beat...")
+
+            # Reload patterns from disk
+            def on_reload():
+                try:
+                    count = pattern_engine.reload_strudel_patterns()
+                    mark_dirty(f"Reloaded {count} patterns")
+                except Exception as e:
+                    mark_dirty(f"Reload error: {e}")
+
+            # Pattern selector (full list)
+            def on_pattern_selector():
+                with ui_draw_lock:
+                    pattern_selector_input(pattern_engine, keyboard)
+                mark_dirty("")
+
+            # Palette selector (full list)
+            def on_palette_selector():
+                with ui_draw_lock:
+                    palette_selector_input(pattern_engine, keyboard)
+                mark_dirty("")
+
+            key_handlers = {
+                "q": on_quit,
+                "\t": on_tab,
+                **{str(d): functools.partial(on_digit, d) for d in range(10)},
+                "[": on_prev,
+                "]": on_next,
+                " ": on_space,
+                ".": on_tap,
+                "b": on_blackout,
+                "f": on_flash,
+                "r": on_reset,
+                "R": on_reload,
+                "p": on_pattern_selector,
+                "c": on_palette_selector,
+            }
 
-            while engine_state.running:
-                # Check for keyboard input
-                key = keyboard.get_key()
-                if key:
-                    if key == "q":
-                        engine_state.running = False
-                        break
+            # MIDI message handlers, dispatched by type through midi_handlers below
+            def on_clock(msg: mido.Message):
+                nonlocal tick_count, beat_count, pending_reset, last_beat_time_ns, current_bpm
+                nonlocal ui_bar, ui_beat, ui_bpm, ui_message
+                tick_count += 1
+                if tick_count >= TICKS_PER_BEAT:
+                    tick_count = 0
+                    beat_count += 1
+                    now_ns = time.monotonic_ns()
 
-                    # Tab: toggle mode
-                    elif key == "\t":
-                        ui_mode = "palette" if ui_mode == "pattern" else "pattern"
-                        ui_message = ""
-                        redraw()
-
-                    # Number selection (mode-dependent)
-                    elif key == "0":
-                        if ui_mode == "palette":
-                            pattern_engine.set_palette(None)  # Clear override
-                            ui_message = ""
-                            redraw()
-
-                    elif key in "123456789":
-                        if ui_mode == "pattern":
-                            # Pattern selection
-                            idx = int(key) - 1
-                            if pattern_engine.set_pattern_by_index(idx):
-                                ui_message = ""
-                                redraw()
-                        else:
-                            # Palette selection
-                            idx = int(key) - 1
-                            palette_info = pattern_engine.get_available_palettes()
-                            palettes = [p["name"] if isinstance(p, dict) else p for p in palette_info]
-                            if idx < len(palettes):
-                                pattern_engine.set_palette(palettes[idx])
-                                ui_message = ""
-                                redraw()
-
-                    # Previous/Next (mode-dependent)
-                    elif key == "[":
-                        if ui_mode == "pattern":
-                            pattern_engine.prev_pattern()
-                        else:
-                            # Cycle through palettes (prev)
-                            palette_info = pattern_engine.get_available_palettes()
-                            palettes = [p["name"] if isinstance(p, dict) else p for p in palette_info]
-                            override = pattern_engine.get_palette_override()
-                            if override is None:
-                                # From default, go to last palette
-                                if palettes:
-                                    pattern_engine.set_palette(palettes[-1])
-                            else:
-                                try:
-                                    idx = palettes.index(override)
-                                    if idx == 0:
-                                        pattern_engine.set_palette(None)  # Back to default
-                                    else:
-                                        pattern_engine.set_palette(palettes[idx - 1])
-                                except ValueError:
-                                    pattern_engine.set_palette(None)
-                        ui_message = ""
-                        redraw()
-
-                    elif key == "]":
-                        if ui_mode == "pattern":
-                            pattern_engine.next_pattern()
-                        else:
-                            # Cycle through palettes (next)
-                            palette_info = pattern_engine.get_available_palettes()
-                            palettes = [p["name"] if isinstance(p, dict) else p for p in palette_info]
-                            override = pattern_engine.get_palette_override()
-                            if override is None:
-                                # From default, go to first palette
-                                if palettes:
-                                    pattern_engine.set_palette(palettes[0])
-                            else:
-                                try:
-                                    idx = palettes.index(override)
-                                    if idx >= len(palettes) - 1:
-                                        pattern_engine.set_palette(None)  # Back to default
-                                    else:
-                                        pattern_engine.set_palette(palettes[idx + 1])
-                                except ValueError:
-                                    pattern_engine.set_palette(None)
-                        ui_message = ""
-                        redraw()
-
-                    # Spacebar: Send MIDI note (for Ableton MIDI mapping) and reset beat counter
-                    elif key == " ":
-                        # Send note C4 (note 60) on channel 0 - MIDI map this to Ableton's play/restart
-                        midi_out.send(mido.Message("note_on", note=60, velocity=127, channel=0))
-                        midi_out.send(mido.Message("note_off", note=60, velocity=0, channel=0))
-                        # Reset our beat tracking to beat 1
+                    # Handle quantized reset
+                    if pending_reset:
+                        pending_reset = False
                         tick_count = 0
-                        beat_count = 1
+                        beat_count = 1  # Reset to beat 1
                         ui_bar = 1
                         ui_beat = 1
-                        last_beat_time = time.time()
+                        engine_state.publish_beat(0.0, current_bpm, 1)
+                        ui_message = "SYNCED!"
+                        last_beat_time_ns = now_ns
+                        mark_dirty()
+                        return
+
+                    # Calculate BPM from beat timing
+                    # (integer monotonic nanoseconds: immune to clock
+                    # adjustments, no precision lost in the subtraction)
+                    beat_duration_ns = now_ns - last_beat_time_ns
+                    if beat_duration_ns > 0:
+                        current_bpm = 60_000_000_000 / beat_duration_ns
+                    last_beat_time_ns = now_ns
+
+                    # Update UI state
+                    ui_beat = ((beat_count - 1) % 4) + 1
+                    ui_bar = (beat_count - 1) // 4 + 1
+                    ui_bpm = current_bpm
+                    ui_message = ""
+
+                    # Check for queued pattern trigger at bar boundary (beat 1)
+                    if ui_beat == 1:
                         with engine_state.lock:
-                            engine_state.beat_position = 0.0
-                            engine_state.beat_count = 1
-                        ui_message = "SYNC → Bar 1"
-                        redraw()
-
-                    # Period: Send MIDI note for tap tempo (for Ableton MIDI mapping)
-                    elif key == ".":
-                        # Send note C#4 (note 61) on channel 0 - MIDI map this to tap tempo
-                        midi_out.send(mido.Message("note_on", note=61, velocity=127, channel=0))
-                        midi_out.send(mido.Message("note_off", note=61, velocity=0, channel=0))
-                        ui_message = "TAP"
-                        redraw()
-
-                    # Blackout toggle
-                    elif key == "b":
-                        is_blackout = pattern_engine.toggle_blackout()
-                        ui_message = "BLACKOUT" if is_blackout else ""
-                        redraw()
-
-                    # Flash
-                    elif key == "f":
-                        pattern_engine.trigger_quick_action(QuickAction.flash(duration_beats=0.5))
-                        ui_message = "FLASH!"
-                        redraw()
-
-                    # Reset beat position (quantized to next beat)
-                    elif key == "r":
-                        pending_reset = True
-                        ui_message = "Reset on next beat..."
-                        redraw()
-
-                    # Reload patterns from disk
-                    elif key == "R":
-                        try:
-                            count = pattern_engine.reload_strudel_patterns()
-                            ui_message = f"Reloaded {count} patterns"
-                        except Exception as e:
-                            ui_message = f"Reload error: {e}"
-                        redraw()
-
-                    # Pattern selector (full list)
-                    elif key == "p":
-                        pattern_selector_input(pattern_engine, keyboard)
-                        ui_message = ""
-                        redraw()
-
-                    # Palette selector (full list)
-                    elif key == "c":
-                        palette_selector_input(pattern_engine, keyboard)
-                        ui_message = ""
-                        redraw()
-
-                # Receive with timeout so we can check for shutdown
-                msg = port.poll()  # Non-blocking
-
-                if msg is None:
-                    time.sleep(0.001)  # Brief sleep when no MIDI to reduce CPU
-                    continue
+                            queued_idx = engine_state.queued_pattern_index
+                            target_bar = engine_state.queue_target_bar
+                        if queued_idx is not None and target_bar is not None:
+                            if ui_bar >= target_bar:
+                                pattern_engine.set_pattern_by_index(queued_idx)
+                                with engine_state.lock:
+                                    engine_state.queued_pattern_index = None
+                                    engine_state.queue_target_bar = None
+                                ui_message = "Queued!"
+
+                    # Redraw on each beat
+                    mark_dirty()
+
+                # Calculate beat_position (0-indexed: beat 1 starts at 0.0)
+                beat_position = (beat_count - 1) + _TICK_FRAC[tick_count]
+
+                # Update shared state (one lock-free store, see EngineState)
+                engine_state.publish_beat(beat_position, current_bpm, beat_count)
+
+            def on_start(msg: mido.Message):
+                nonlocal tick_count, beat_count, last_beat_time_ns, ui_bar, ui_beat
+                tick_count = 0
+                beat_count = 1  # Start at beat 1
+                last_beat_time_ns = time.monotonic_ns()
+                ui_bar = 1
+                ui_beat = 1
+                engine_state.publish_beat(0.0, current_bpm, 1)
+                mark_dirty("MIDI Start")
+
+            def on_stop(msg: mido.Message):
+                mark_dirty("MIDI Stop")
+
+            def on_continue(msg: mido.Message):
+                nonlocal tick_count, beat_count, last_beat_time_ns, ui_bar, ui_beat
+                tick_count = 0
+                beat_count = 1  # Reset to beat 1
+                last_beat_time_ns = time.monotonic_ns()
+                ui_bar = 1
+                ui_beat = 1
+                engine_state.publish_beat(0.0, current_bpm, 1)
+                mark_dirty("MIDI Continue")
+
+            def on_songpos(msg: mido.Message):
+                nonlocal tick_count, beat_count, ui_bar, ui_beat
+                # Song position is in "MIDI beats" (16th notes), 4 per quarter note
+                position = msg.pos
+                beat_count = position // 4 + 1  # 1-indexed
+                tick_count = (position % 4) * (TICKS_PER_BEAT // 4)
+                ui_beat = ((beat_count - 1) % 4) + 1
+                ui_bar = (beat_count - 1) // 4 + 1
+                engine_state.publish_beat(
+                    (beat_count - 1) + _TICK_FRAC[tick_count], current_bpm, beat_count
+                )
+                mark_dirty(f"Position: Bar {ui_bar} Beat {ui_beat}")
+
+            midi_handlers = {
+                "clock": on_clock,
+                "start": on_start,
+                "stop": on_stop,
+                "continue": on_continue,
+                "songpos": on_songpos,
+            }
 
-                if msg.type == "clock":
-                    tick_count += 1
-                    if tick_count >= TICKS_PER_BEAT:
-                        tick_count = 0
-                        beat_count += 1
-                        now = time.time()
-
-                        # Handle quantized reset
-                        if pending_reset:
-                            pending_reset = False
-                            tick_count = 0
-                            beat_count = 1  # Reset to beat 1
-                            ui_bar = 1
-                            ui_beat = 1
-                            with engine_state.lock:
-                                engine_state.beat_position = 0.0
-                                engine_state.beat_count = 1
-                            ui_message = "SYNCED!"
-                            last_beat_time = now
-                            redraw()
-                            continue
-
-                        # Calculate BPM from beat timing
-                        beat_duration = now - last_beat_time
-                        if beat_duration > 0 and last_beat_time > 0:
-                            current_bpm = 60.0 / beat_duration
-                        last_beat_time = now
-
-                        # Update UI state
-                        ui_beat = ((beat_count - 1) % 4) + 1
-                        ui_bar = (beat_count - 1) // 4 + 1
-                        ui_bpm = current_bpm
-                        ui_message = ""
-
-                        # Check for queued pattern trigger at bar boundary (beat 1)
-                        if ui_beat == 1:
-                            with engine_state.lock:
-                                queued_idx = engine_state.queued_pattern_index
-                                target_bar = engine_state.queue_target_bar
-                            if queued_idx is not None and target_bar is not None:
-                                if ui_bar >= target_bar:
-                                    pattern_engine.set_pattern_by_index(queued_idx)
-                                    with engine_state.lock:
-                                        engine_state.queued_pattern_index = None
-                                        engine_state.queue_target_bar = None
-                                    ui_message = "Queued!"
-
-                        # Redraw on each beat
-                        redraw()
-
-                    # Calculate beat_position (0-indexed: beat 1 starts at 0.0)
-                    beat_position = (beat_count - 1) + tick_count / TICKS_PER_BEAT
-
-                    # Update shared state
-                    with engine_state.lock:
-                        engine_state.beat_position = beat_position
-                        engine_state.bpm = current_bpm
-                        engine_state.beat_count = beat_count
-
-                elif msg.type == "start":
-                    tick_count = 0
-                    beat_count = 1  # Start at beat 1
-                    last_beat_time = time.time()
-                    ui_bar = 1
-                    ui_beat = 1
-                    ui_message = "MIDI Start"
-                    with engine_state.lock:
-                        engine_state.beat_position = 0.0
-                        engine_state.beat_count = 1
+            while engine_state.running:
+                # Draw whatever the previous iteration changed, in one go
+                if needs_redraw:
+                    needs_redraw = False
                     redraw()
 
-                elif msg.type == "stop":
-                    ui_message = "MIDI Stop"
-                    redraw()
+                # Sleep until MIDI arrives, a key is pressed, or shutdown
+                ready = select.select([midi_in, keyboard], [], [])[0]
+                if keyboard in ready:
+                    keyboard.fill()
+                # Keys are taken one at a time, so a selector opened by one
+                # key reads the keys typed after it
+                while engine_state.running and (key := keyboard.get_key()) is not None:
+                    handler = key_handlers.get(key)
+                    if handler is not None:
+                        handler()
+                if not engine_state.running:
+                    break
 
-                elif msg.type == "continue":
-                    tick_count = 0
-                    beat_count = 1  # Reset to beat 1
-                    last_beat_time = time.time()
-                    ui_bar = 1
-                    ui_beat = 1
-                    ui_message = "MIDI Continue"
-                    with engine_state.lock:
-                        engine_state.beat_position = 0.0
-                        engine_state.beat_count = 1
-                    redraw()
+                if midi_in not in ready:
+                    continue
 
-                elif msg.type == "songpos":
-                    # Song position is in "MIDI beats" (16th notes), 4 per quarter note
-                    position = msg.pos
-                    beat_count = position // 4 + 1  # 1-indexed
-                    tick_count = (position % 4) * (TICKS_PER_BEAT // 4)
-                    ui_beat = ((beat_count - 1) % 4) + 1
-                    ui_bar = (beat_count - 1) // 4 + 1
-                    ui_message = f"Position: Bar {ui_bar} Beat {ui_beat}"
-                    with engine_state.lock:
-                        engine_state.beat_count = beat_count
-                        engine_state.beat_position = (beat_count - 1) + tick_count / TICKS_PER_BEAT
-                    redraw()
+                midi_in.clear_wakeups()
+                while midi_in.messages:
+                    msg = midi_in.messages.popleft()
+                    handler = midi_handlers.get(msg.type)
+                    if handler is not None:
+                        handler(msg)
 
     except Exception as e:
         print(f"\n[ERROR] {e}")
         import traceback
         traceback.print_exc()
     finally:
-        print(SHOW_CURSOR, end="", flush=True)
         engine_state.running = False
+        ui_dirty.set()  # Let the UI thread see the shutdown and exit
+        if ui_thread.is_alive():
+            ui_thread.join(timeout=1.0)
+        print(SHOW_CURSOR, end="", flush=True)
         keyboard.stop()
         render_thread.join(timeout=1.0)
         # Stop control server
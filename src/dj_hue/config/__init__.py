@@ -1,14 +1,24 @@
-"""Configuration schema and loading."""
-
-from .schema import (
-    DJHueConfig,
-    AudioInputConfig,
-    HueConfig,
-    FrequencyBandConfig,
-    LightMappingConfig,
-    LightGroupConfig,
-)
-from .loader import load_config, save_config
+"""Configuration schema and loading.
+
+Exports are imported on first access, so importing the package stays cheap
+for callers that only need part of it.
+"""
+
+import importlib
+
+# Public name -> submodule that defines it
+_LAZY_EXPORTS = {
+    "DJHueConfig": ".schema",
+    "AudioInputConfig": ".schema",
+    "HueConfig": ".schema",
+    "FrequencyBandConfig": ".schema",
+    "LightMappingConfig": ".schema",
+    "LightGroupConfig": ".schema",
+    "load_config": ".loader",
+    "save_config": ".loader",
+    "load_config_pickle": ".loader",
+    "save_config_pickle": ".loader",
+}
 
 __all__ = [
     "DJHueConfig",
@@ -19,4 +29,19 @@ __all__ = [
     "LightGroupConfig",
     "load_config",
     "save_config",
+    "load_config_pickle",
+    "save_config_pickle",
 ]
+
+
+def __getattr__(name: str):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value  # Cache so later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -1,7 +1,12 @@
 """Configuration file loading and saving."""
 
+import dataclasses
+import functools
+import os
+import pickle
+import warnings
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 import yaml
 
 from .schema import (
@@ -13,11 +18,156 @@ from .schema import (
     LightGroupConfig,
 )
 
+try:
+    from yaml import CSafeDumper as _YamlDumper, CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper as _YamlDumper, SafeLoader as _YamlLoader
+
+try:
+    import msgspec
+except ImportError:  # Optional: dataclasses.asdict is used instead
+    msgspec = None
+
+
+class _ConfigDumper(_YamlDumper):
+    """Dumper that emits the schema dataclasses directly as YAML mappings."""
+
+    def ignore_aliases(self, data: Any) -> bool:
+        # Plain mappings, never &anchors, even if a config object is reused
+        return True
+
+
+def _add_config_representer(cls: type) -> None:
+    # Field order gives the file layout; derived caches aren't written
+    names = tuple(f.name for f in dataclasses.fields(cls) if not f.name.startswith("_"))
+
+    def represent(dumper: _ConfigDumper, obj: Any) -> yaml.Node:
+        return dumper.represent_mapping(
+            "tag:yaml.org,2002:map", [(name, getattr(obj, name)) for name in names]
+        )
+
+    _ConfigDumper.add_representer(cls, represent)
+
+
+def _represent_djhue_config(dumper: _ConfigDumper, config: DJHueConfig) -> yaml.Node:
+    items = [
+        ("audio", config.audio),
+        ("frequency_bands", config.frequency_bands),
+        ("light_groups", config.light_groups),
+        ("beat_detection", config.beat_detection),
+        ("smoothing", config.smoothing),
+    ]
+    # Hue credentials go last, and only when configured
+    if config.hue:
+        items.append(("hue", config.hue))
+    return dumper.represent_mapping("tag:yaml.org,2002:map", items)
+
+
+for _cls in (AudioInputConfig, HueConfig, FrequencyBandConfig, LightMappingConfig, LightGroupConfig):
+    _add_config_representer(_cls)
+_ConfigDumper.add_representer(DJHueConfig, _represent_djhue_config)
+
+
+def _config_to_data(config: DJHueConfig) -> dict[str, Any]:
+    """Convert a config to plain dicts and lists, for non-PyYAML backends."""
+    # msgspec does this walk in C
+    if msgspec is not None:
+        data: dict[str, Any] = msgspec.to_builtins(config)
+    else:
+        data = dataclasses.asdict(config)
+
+    # Derived caches aren't part of the file format
+    data = {k: v for k, v in data.items() if not k.startswith("_")}
+
+    # Hue credentials go last, and only when configured
+    hue = data.pop("hue")
+    if hue:
+        data["hue"] = hue
+    return data
+
+
+def _pyyaml_loads(raw: bytes) -> Any:
+    return yaml.load(raw, Loader=_YamlLoader)
+
+
+def _pyyaml_dumps(config: DJHueConfig) -> str:
+    # The representers emit straight from the dataclasses, no dict copy first
+    return yaml.dump(config, Dumper=_ConfigDumper, default_flow_style=False, sort_keys=False)
+
+
+def _get_yaml_backend() -> tuple[Callable[[bytes], Any], Callable[[DJHueConfig], str]]:
+    """Return the (loads, dumps) pair named by DJHUE_YAML_BACKEND.
+
+    "pyyaml" (the default) uses PyYAML; "yaml_rs" or "pyyaml_rs" select that
+    Rust parser, and "auto" uses the first of them that is installed. The
+    variable is read on every call, so it can be changed between loads.
+    """
+    return _yaml_backend(os.environ.get("DJHUE_YAML_BACKEND", "pyyaml").lower())
+
+
+@functools.cache
+def _yaml_backend(backend: str) -> tuple[Callable[[bytes], Any], Callable[[DJHueConfig], str]]:
+    candidates = ("yaml_rs", "pyyaml_rs") if backend == "auto" else (backend,)
+
+    for name in candidates:
+        if name == "yaml_rs":
+            try:
+                import yaml_rs
+            except ImportError:
+                if backend != "auto":
+                    raise
+                continue
+            return (
+                lambda raw: yaml_rs.loads(raw.decode("utf-8")),
+                lambda config: yaml_rs.dumps(_config_to_data(config)),
+            )
+        if name == "pyyaml_rs":
+            try:
+                import pyyaml_rs
+            except ImportError:
+                if backend != "auto":
+                    raise
+                continue
+            return pyyaml_rs.safe_load, (
+                lambda config: pyyaml_rs.safe_dump(
+                    _config_to_data(config), default_flow_style=False, sort_keys=False
+                )
+            )
+        if name != "pyyaml":
+            warnings.warn(
+                f"Unknown DJHUE_YAML_BACKEND {backend!r}; using PyYAML", RuntimeWarning
+            )
+
+    return _pyyaml_loads, _pyyaml_dumps
+
+
+# Parsed configs by path, with the (mtime_ns, size) they were read at
+_CONFIG_CACHE: dict[str, tuple[int, int, DJHueConfig]] = {}
+
 
 def load_config(config_path: Path) -> DJHueConfig:
-    """Load configuration from YAML file."""
-    with open(config_path) as f:
-        data = yaml.safe_load(f) or {}
+    """Load configuration from YAML file.
+
+    The file is only re-parsed when its mtime or size changes. Configs are
+    immutable, so the cached object itself is returned.
+    """
+    key = str(config_path)
+    st = os.stat(config_path)
+    cached = _CONFIG_CACHE.get(key)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+
+    # Bytes let the parser detect the encoding and decode it natively
+    config = _parse_config(_get_yaml_backend()[0](Path(config_path).read_bytes()) or {})
+    _CONFIG_CACHE[key] = (st.st_mtime_ns, st.st_size, config)
+    return config
+
+
+load_config.cache_clear = _CONFIG_CACHE.clear
+
+
+def _parse_config(data: dict[str, Any]) -> DJHueConfig:
+    """Build a DJHueConfig from parsed YAML data."""
 
     # Parse audio config
     audio_data = data.get("audio", {})
@@ -71,13 +221,13 @@ def load_config(config_path: Path) -> DJHueConfig:
                 min_brightness=light_data.get("min_brightness", 0.1),
                 beat_reactive=light_data.get("beat_reactive", True),
             ))
-        groups.append(LightGroupConfig(name=group_data["name"], lights=lights))
+        groups.append(LightGroupConfig(name=group_data["name"], lights=tuple(lights)))
 
     return DJHueConfig(
         audio=audio,
         hue=hue,
-        frequency_bands=bands,
-        light_groups=groups,
+        frequency_bands=tuple(bands),
+        light_groups=tuple(groups),
         beat_detection=data.get("beat_detection", True),
         smoothing=data.get("smoothing", 0.3),
     )
@@ -85,47 +235,22 @@ def load_config(config_path: Path) -> DJHueConfig:
 
 def save_config(config: DJHueConfig, config_path: Path) -> None:
     """Save configuration to YAML file."""
-    data: dict[str, Any] = {
-        "audio": {
-            "device": config.audio.device,
-            "sample_rate": config.audio.sample_rate,
-            "block_size": config.audio.block_size,
-            "channels": config.audio.channels,
-        },
-        "frequency_bands": [
-            {"name": b.name, "low_hz": b.low_hz, "high_hz": b.high_hz}
-            for b in config.frequency_bands
-        ],
-        "light_groups": [
-            {
-                "name": g.name,
-                "lights": [
-                    {
-                        "light_id": l.light_id,
-                        "frequency_band": l.frequency_band,
-                        "base_hue": l.base_hue,
-                        "saturation": l.saturation,
-                        "sensitivity": l.sensitivity,
-                        "min_brightness": l.min_brightness,
-                        "beat_reactive": l.beat_reactive,
-                    }
-                    for l in g.lights
-                ],
-            }
-            for g in config.light_groups
-        ],
-        "beat_detection": config.beat_detection,
-        "smoothing": config.smoothing,
-    }
+    Path(config_path).write_text(_get_yaml_backend()[1](config), encoding="utf-8")
+    _CONFIG_CACHE.pop(str(config_path), None)
 
-    if config.hue:
-        data["hue"] = {
-            "bridge_ip": config.hue.bridge_ip,
-            "username": config.hue.username,
-            "clientkey": config.hue.clientkey,
-            "entertainment_area_id": config.hue.entertainment_area_id,
-            "fps": config.hue.fps,
-        }
-
-    with open(config_path, "w") as f:
-        yaml.dump(data, f, default_flow_style=False, sort_keys=False)
+
+def save_config_pickle(config: DJHueConfig, path: Path) -> None:
+    """Save an already-parsed configuration for other processes to load.
+
+    Loading the pickle is much faster than parsing the YAML again. Only load
+    pickles this app wrote itself.
+    """
+    Path(path).write_bytes(pickle.dumps(config, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def load_config_pickle(path: Path) -> DJHueConfig:
+    """Load a configuration saved by ``save_config_pickle``."""
+    config = pickle.loads(Path(path).read_bytes())
+    if not isinstance(config, DJHueConfig):
+        raise TypeError(f"{path} does not contain a DJHueConfig")
+    return config
@@ -1,10 +1,11 @@
 """Configuration dataclasses."""
 
 from dataclasses import dataclass, field
-from typing import Optional
+from types import MappingProxyType
+from typing import Mapping, Optional
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AudioInputConfig:
     """Audio input configuration."""
     device: Optional[str] = None  # Device name or None for default
@@ -13,7 +14,7 @@ class AudioInputConfig:
     channels: int = 1
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class FrequencyBandConfig:
     """Frequency band definition."""
     name: str
@@ -21,7 +22,7 @@ class FrequencyBandConfig:
     high_hz: float
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class LightMappingConfig:
     """Mapping of a light to a frequency band."""
     light_id: int
@@ -33,14 +34,18 @@ class LightMappingConfig:
     beat_reactive: bool = True
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class LightGroupConfig:
     """Group of light mappings."""
     name: str
-    lights: list[LightMappingConfig] = field(default_factory=list)
+    lights: tuple[LightMappingConfig, ...] = ()
 
+    def __post_init__(self) -> None:
+        # Tuples keep the whole config immutable (and DJHueConfig's caches valid)
+        object.__setattr__(self, "lights", tuple(self.lights))
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class HueConfig:
     """Philips Hue bridge configuration."""
     bridge_ip: str
@@ -50,30 +55,51 @@ class HueConfig:
     fps: int = 25
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DJHueConfig:
     """Main application configuration."""
     audio: AudioInputConfig = field(default_factory=AudioInputConfig)
     hue: Optional[HueConfig] = None
-    frequency_bands: list[FrequencyBandConfig] = field(default_factory=list)
-    light_groups: list[LightGroupConfig] = field(default_factory=list)
+    frequency_bands: tuple[FrequencyBandConfig, ...] = ()
+    light_groups: tuple[LightGroupConfig, ...] = ()
     beat_detection: bool = True
     smoothing: float = 0.3
 
-    def get_all_light_mappings(self) -> list[LightMappingConfig]:
-        """Get flattened list of all light mappings."""
-        mappings = []
-        for group in self.light_groups:
-            mappings.extend(group.lights)
-        return mappings
+    # Derived from light_groups once in __post_init__; valid for the config's
+    # lifetime because it is frozen all the way down
+    _all_mappings: tuple[LightMappingConfig, ...] = field(init=False, repr=False, compare=False)
+    _mappings_by_band: dict[str, tuple[LightMappingConfig, ...]] = field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "frequency_bands", tuple(self.frequency_bands))
+        object.__setattr__(self, "light_groups", tuple(self.light_groups))
+
+        mappings = tuple(light for group in self.light_groups for light in group.lights)
+        by_band: dict[str, list[LightMappingConfig]] = {}
+        for light in mappings:
+            by_band.setdefault(light.frequency_band, []).append(light)
+        object.__setattr__(self, "_all_mappings", mappings)
+        object.__setattr__(
+            self, "_mappings_by_band", {band: tuple(lights) for band, lights in by_band.items()}
+        )
+
+    def get_all_light_mappings(self) -> tuple[LightMappingConfig, ...]:
+        """Get flattened tuple of all light mappings."""
+        return self._all_mappings
+
+    def get_mappings_by_band(self) -> Mapping[str, tuple[LightMappingConfig, ...]]:
+        """Get light mappings grouped by frequency band name (read-only view)."""
+        return MappingProxyType(self._mappings_by_band)
 
     @classmethod
     def with_defaults(cls) -> "DJHueConfig":
         """Create config with sensible defaults."""
         return cls(
-            frequency_bands=[
+            frequency_bands=(
                 FrequencyBandConfig("bass", 20, 250),
                 FrequencyBandConfig("mid", 250, 2000),
                 FrequencyBandConfig("high", 2000, 20000),
-            ]
+            )
         )
@@ -139,9 +139,7 @@ class ControlServer:
         elif cmd_type == "sync":
             self._send_midi_note(60)  # C4 - sync/restart
             # Also reset our beat tracking
-            with self.engine_state.lock:
-                self.engine_state.beat_position = 0.0
-                self.engine_state.beat_count = 1
+            self.engine_state.reset_beat()
 
         elif cmd_type == "start":
             self._send_midi_start()
@@ -179,14 +177,15 @@ class ControlServer:
             value = max(0.0, min(1.0, float(value)))
             if zone in ("ceiling", "perimeter", "ambient"):
                 with self.engine_state.lock:
-                    self.engine_state.zone_brightness[zone] = value
+                    self.engine_state.set_zone_brightness(zone, value)
                 await self._broadcast_status()
 
         elif cmd_type == "fade_out":
             import time
             with self.engine_state.lock:
-                self.engine_state.fade_active = True
+                # Start time first: the render thread reads fade_active without the lock
                 self.engine_state.fade_start_time = time.time()
+                self.engine_state.fade_active = True
             await self._broadcast_status()
 
         elif cmd_type == "set_queue_mode":
@@ -259,7 +258,7 @@ class ControlServer:
         with self.engine_state.lock:
             beat_position = self.engine_state.beat_position
             bpm = self.engine_state.bpm
-            zone_brightness = dict(self.engine_state.zone_brightness)
+            zone_brightness = self.engine_state.zone_brightness
             fade_active = self.engine_state.fade_active
             queue_mode = self.engine_state.queue_mode
             queued_pattern_index = self.engine_state.queued_pattern_index
@@ -370,9 +369,10 @@ class ControlServer:
         import time
 
         # Set the identify flag - render loop will handle the actual flashing
+        # End time first: the render thread reads the index without the lock
         with self.engine_state.lock:
-            self.engine_state.identify_light_index = index
             self.engine_state.identify_until = time.time() + 1.0  # Flash for 1 second
+            self.engine_state.identify_light_index = index
 
         print(f"[CONTROL] Identifying light {index}")
 
@@ -12,6 +12,8 @@ import colorsys
 import math
 import time
 
+import numpy as np
+
 
 # =============================================================================
 # WAVEFORM GENERATORS
@@ -435,6 +437,28 @@ class EffectsEngine:
         """Update beat clock. Call every frame."""
         self.beat_clock.update(detected_beat, detected_bpm)
 
+    def _effect_for_light(self, pattern: Pattern, i: int) -> LightEffect:
+        """Get the effect driving light ``i``, wrapping for lights beyond the pattern."""
+        if i < len(pattern.effects):
+            return pattern.effects[i]
+        # Fallback for lights beyond pattern definition
+        return pattern.effects[i % len(pattern.effects)]
+
+    @staticmethod
+    def _effect_rgb(effect: LightEffect, beat_pos: float) -> tuple[int, int, int]:
+        """Compute one effect's color as 0-255 ints at the given beat position."""
+        # Get intensity from phaser
+        intensity = effect.intensity_phaser.get_value(beat_pos)
+
+        # Get hue (base + optional phaser modulation)
+        hue = effect.base_hue
+        if effect.hue_phaser:
+            hue_offset = effect.hue_phaser.get_value(beat_pos)
+            hue = (hue + hue_offset) % 1.0
+
+        r, g, b = colorsys.hsv_to_rgb(hue % 1.0, effect.saturation, intensity)
+        return int(r * 255), int(g * 255), int(b * 255)
+
     def compute_colors(self) -> dict[int, RGB]:
         """
         Compute colors for all lights based on current pattern and beat position.
@@ -442,30 +466,35 @@ class EffectsEngine:
         Returns:
             Dictionary mapping light index to RGB color
         """
-        colors = {}
         pattern = self.current_pattern
         beat_pos = self.beat_clock.beat_position
 
-        for i in range(self.num_lights):
-            if i < len(pattern.effects):
-                effect = pattern.effects[i]
-            else:
-                # Fallback for lights beyond pattern definition
-                effect = pattern.effects[i % len(pattern.effects)]
+        return {
+            i: RGB(*self._effect_rgb(self._effect_for_light(pattern, i), beat_pos))
+            for i in range(self.num_lights)
+        }
 
-            # Get intensity from phaser
-            intensity = effect.intensity_phaser.get_value(beat_pos)
+    def compute_colors_into(self, out: np.ndarray) -> np.ndarray:
+        """
+        Compute colors for all lights straight into a preallocated array.
 
-            # Get hue (base + optional phaser modulation)
-            hue = effect.base_hue
-            if effect.hue_phaser:
-                hue_offset = effect.hue_phaser.get_value(beat_pos)
-                hue = (hue + hue_offset) % 1.0
+        Avoids the per-light RGB objects and dict of compute_colors() for
+        callers that stream the colors every frame.
+
+        Args:
+            out: (num_lights, 3) uint8 array, filled in place
 
-            # Create color
-            colors[i] = RGB.from_hsv(hue, effect.saturation, intensity)
+        Returns:
+            ``out``
+        """
+        pattern = self.current_pattern
+        beat_pos = self.beat_clock.beat_position
 
-        return colors
+        out[:] = [
+            self._effect_rgb(self._effect_for_light(pattern, i), beat_pos)
+            for i in range(self.num_lights)
+        ]
+        return out
 
     def compute_unified_color(self) -> RGB:
         """
@@ -16,6 +16,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Callable
 
+import numpy as np
+
 from ..lights.effects import BeatClock, RGB
 from .common.groups import LightSetup
 from .loader import load_patterns, reload_patterns
@@ -113,6 +115,10 @@ class PatternEngine:
         # Palette state
         self._active_palette: Palette | None = None
         self._palette_override: str | None = None  # User-selected, persists across patterns
+        # Palette names in display order and name -> position, rebuilt when
+        # the registry grows (see _get_palette_index)
+        self._palette_names: list[str] = []
+        self._palette_index: dict[str, int] = {}
 
         # Quick action state
         self._active_quick_action: QuickAction | None = None
@@ -364,6 +370,45 @@ class PatternEngine:
         """Get the current palette override (None if using pattern default)."""
         return self._palette_override
 
+    def get_palette_names(self) -> list[str]:
+        """Get the names of all available palettes, in display order."""
+        return list_palettes()
+
+    def _get_palette_index(self) -> dict[str, int]:
+        """Palette name -> position in get_palette_names().
+
+        Palettes are only ever registered, never removed, so the index is
+        rebuilt only when the registry size changes.
+        """
+        if len(self._palette_index) != len(PALETTES):
+            self._palette_names = list_palettes()
+            self._palette_index = {name: i for i, name in enumerate(self._palette_names)}
+        return self._palette_index
+
+    def cycle_palette(self, direction: int) -> str | None:
+        """
+        Step the palette override to the next (1) or previous (-1) palette.
+
+        Default (no override) sits before the first and after the last
+        palette, so cycling passes through it. An override that is no
+        longer registered also falls back to default.
+
+        Returns the new override (None for default).
+        """
+        index = self._get_palette_index()
+        if not index:
+            return self._palette_override
+        if self._palette_override is None:
+            new_idx = 0 if direction > 0 else len(index) - 1
+        else:
+            idx = index.get(self._palette_override)
+            new_idx = -1 if idx is None else idx + direction
+        if 0 <= new_idx < len(index):
+            self.set_palette(self._palette_names[new_idx])
+        else:
+            self.set_palette(None)
+        return self._palette_override
+
     def get_available_palettes(self) -> list[dict]:
         """Get list of all available palettes with their colors."""
         result = []
@@ -494,6 +539,41 @@ class PatternEngine:
 
         return self._scheduler.compute_colors(self.beat_clock.beat_position)
 
+    def compute_colors_into(self, out: np.ndarray) -> np.ndarray:
+        """
+        Compute colors for all lights straight into a preallocated array.
+
+        Same result as compute_colors(), for render loops that work on
+        arrays: fills ``out`` (shape (num_lights, 3), float) with 0.0-1.0
+        RGB values in place. Blackout and uniform quick actions fill the
+        whole array at once without building per-light RGB objects.
+
+        Returns:
+            ``out``
+        """
+        action = self._active_quick_action
+        if self._blackout or (self._scheduler is None and not action):
+            out.fill(0.0)
+            return out
+
+        if action:
+            if action.action_type == "flash":
+                out.fill(1.0)
+            elif action.action_type == "color_bump" and action.hue is not None:
+                color = RGB.from_hsv(action.hue, 1.0, action.intensity)
+                out[:] = (color.r / 255.0, color.g / 255.0, color.b / 255.0)
+            else:
+                out.fill(0.0)
+            return out
+
+        out.fill(0.0)
+        num_lights = len(out)
+        for light_id, rgb in self._scheduler.compute_colors(self.beat_clock.beat_position).items():
+            if 0 <= light_id < num_lights:
+                out[light_id] = (rgb.r, rgb.g, rgb.b)
+        out /= 255.0
+        return out
+
     def _compute_quick_action_colors(self) -> dict[int, RGB]:
         """Compute colors for active quick action."""
         action = self._active_quick_action